@@ -22,8 +22,6 @@ CLASSHUB_SERVICE_DIR = Path(__file__).resolve().parents[1] / "services" / "class
 if str(CLASSHUB_SERVICE_DIR) not in sys.path:
     sys.path.insert(0, str(CLASSHUB_SERVICE_DIR))
 
-from hub.services.authoring_templates import generate_authoring_templates, slug_to_title  # noqa: E402
-
 
 def main() -> int:
     parser = argparse.ArgumentParser()
@@ -36,6 +34,9 @@ def main() -> int:
     parser.add_argument("--overwrite", action="store_true")
     args = parser.parse_args()
 
+    # Deferred until after argument parsing so `--help` stays fast.
+    from hub.services.authoring_templates import generate_authoring_templates, slug_to_title
+
     slug = args.slug.strip()
     title = (args.title or slug_to_title(slug)).strip()
 
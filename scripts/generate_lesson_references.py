@@ -15,11 +15,9 @@ import argparse
 import re
 from pathlib import Path
 
-import yaml
 
-
-HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)")
-LIST_RE = re.compile(r"^(\s*[-*]|\s*\d+[.)])\s+")
+# Headings and list items in one alternation so each line is matched once.
+LINE_RE = re.compile(r"^(?:#{1,6}\s+(?P<heading>.*)|(?:\s*[-*]|\s*\d+[.)])\s+(?P<item>.*))")
 SAFE_KEY_RE = re.compile(r"^[a-z0-9_-]+$")
 
 WANTED_SECTIONS = {
@@ -33,12 +31,20 @@ WANTED_SECTIONS = {
 }
 
 
+def _load_yaml(text: str):
+    # Imported lazily so `--help` does not pay for PyYAML. libyaml's C parser
+    # (CSafeLoader) is much faster than the pure-Python scanner when available.
+    import yaml
+
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
 def _parse_front_matter(raw: str) -> tuple[dict, str]:
     if raw.startswith("---"):
-        parts = raw.split("---", 2)
-        if len(parts) >= 3:
-            fm = yaml.safe_load(parts[1]) or {}
-            body = parts[2].lstrip("\n")
+        end = raw.find("\n---", 3)
+        if end >= 0:
+            fm = _load_yaml(raw[3 : end + 1]) or {}
+            body = raw[end + 4 :].lstrip("\n")
             return fm, body
     return {}, raw
 
@@ -47,21 +53,22 @@ def _collect_sections(body: str) -> dict[str, list[str]]:
     sections: dict[str, list[str]] = {}
     current = None
     for line in body.splitlines():
-        heading = HEADING_RE.match(line)
-        if heading:
-            title = heading.group(2).strip()
-            key = title.lower()
-            current = key
+        m = LINE_RE.match(line)
+        heading = m.group("heading") if m else None
+        if heading is not None:
+            current = heading.strip().lower()
             sections.setdefault(current, [])
             continue
         if current is None:
             continue
-        if LIST_RE.match(line):
-            sections[current].append(LIST_RE.sub("", line).strip())
-        elif line.strip().startswith("**") and ":" in line:
-            sections[current].append(line.strip().strip("*"))
-        elif line.strip().startswith("Stop point:"):
-            sections[current].append(line.strip())
+        if m:
+            sections[current].append(m.group("item").strip())
+            continue
+        stripped = line.strip()
+        if stripped.startswith("**") and ":" in line:
+            sections[current].append(stripped.strip("*"))
+        elif stripped.startswith("Stop point:"):
+            sections[current].append(stripped)
     return sections
 
 
@@ -131,7 +138,7 @@ def main() -> int:
 
     course_path = Path(args.course)
     out_dir = Path(args.out)
-    manifest = yaml.safe_load(course_path.read_text(encoding="utf-8")) or {}
+    manifest = _load_yaml(course_path.read_text(encoding="utf-8")) or {}
     course_dir = course_path.parent
     lessons = manifest.get("lessons") or []
 
@@ -151,7 +158,7 @@ def main() -> int:
         title = lesson.get("title") or fm.get("title") or slug
         session = lesson.get("session")
         ref_text = _render_reference(slug, title, session, fm, sections)
-        (out_dir / f"{slug}.md").write_text(ref_text, encoding="utf-8")
+        (out_dir / f"{slug}.md").write_bytes(ref_text.encode("utf-8"))
 
     return 0
 
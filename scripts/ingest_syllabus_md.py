@@ -13,19 +13,31 @@ Output:
 from __future__ import annotations
 
 import argparse
+import functools
+import os
 import re
 import zipfile
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
 
 COURSES_ROOT = Path("services/classhub/content/courses")
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
-SESSION_RE = re.compile(r"^#?\s*Session\s*(\d+)\s*:\s*(.+)$", re.I)
+# Multiline so headers can be found with one finditer over the whole document;
+# [^\S\n] keeps the optional whitespace from spanning lines.
+SESSION_RE = re.compile(r"^#?[^\S\n]*Session[^\S\n]*(\d+)[^\S\n]*:[^\S\n]*(.+)$", re.I | re.M)
 HEADING_RE = re.compile(r"^(#{2,6})\s+(.*)")
 BULLET_RE = re.compile(r"^\s*[-*•]\s+(.*)")
 NUMBERED_RE = re.compile(r"^\s*\d+[.)]\s+(.*)")
 META_RE = re.compile(r"^\*{0,2}(.+?)\*{0,2}\s*:\s*(.+)$")
+MISSION_RE = re.compile(r"(?:\*{0,2})Mission(?:\*{0,2})\s*:\s*(.+)", re.I)
+HOURS_RE = re.compile(r"(\d+)\s*(hour|hours|hr|hrs)")
+MINUTES_RE = re.compile(r"(\d+)\s*(minute|minutes|min|mins)")
+WEEKS_RE = re.compile(r"for\s+(\d+)\s+weeks")
+SLUG_STRIP_RE = re.compile(r"[^a-z0-9]+")
 
 SECTION_NAMES = {
     "teacher prep",
@@ -37,28 +49,31 @@ SECTION_NAMES = {
     "stuck points",
     "extensions",
 }
+# Longest first so "common stuck points + fixes" wins over its prefixes.
+_SECTION_NAMES_SORTED = tuple(sorted(SECTION_NAMES, key=len, reverse=True))
 
 
+@functools.lru_cache(maxsize=256)
 def _slugify(text: str) -> str:
     text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
+    text = SLUG_STRIP_RE.sub("-", text)
     text = text.strip("-")
     return text or "session"
 
 
-def _yaml_quote(value: str) -> str:
-    escaped = value.replace('"', '\\"')
-    return f"\"{escaped}\""
+def _dump_yaml(data: dict) -> str:
+    # Imported lazily so `--help` does not pay for PyYAML. libyaml's C emitter
+    # (CSafeDumper) is much faster than the pure-Python one when available.
+    import yaml
 
-
-def _yaml_list(key: str, items: list[str], indent: int = 0) -> str:
-    if not items:
-        return ""
-    pad = " " * indent
-    out = f"{pad}{key}:\n"
-    for item in items:
-        out += f"{pad}  - {_yaml_quote(item)}\n"
-    return out
+    return yaml.dump(
+        data,
+        Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+        sort_keys=False,
+        default_flow_style=False,
+        allow_unicode=True,
+        width=4096,  # keep long titles and bullets on one line
+    )
 
 
 def _extract_bullets(lines: list[str]) -> list[str]:
@@ -74,16 +89,40 @@ def _extract_bullets(lines: list[str]) -> list[str]:
     return items
 
 
+def _iter_docx_paragraphs(stream) -> Iterator[str]:
+    """Stream paragraph text out of document.xml in document order.
+
+    Matches ``root.findall(".//w:p")``: a paragraph's text includes any
+    paragraphs nested inside it (text boxes), which are then yielded after it.
+    Only outermost paragraphs are cleared and detached once read, so memory is
+    bounded by the largest paragraph rather than the whole document.
+    """
+    para_tag = f"{W_NS}p"
+    text_tag = f"{W_NS}t"
+    ancestors = []
+    open_paras = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            ancestors.append(elem)
+            if elem.tag == para_tag:
+                open_paras += 1
+            continue
+        ancestors.pop()
+        if elem.tag != para_tag:
+            continue
+        open_paras -= 1
+        if open_paras:
+            continue
+        for para in elem.iter(para_tag):
+            yield "".join(node.text for node in para.iter(text_tag) if node.text)
+        elem.clear()
+        if ancestors:
+            ancestors[-1].remove(elem)
+
+
 def _read_docx_text(path: Path) -> str:
-    with zipfile.ZipFile(path) as zf:
-        xml_data = zf.read("word/document.xml")
-    root = ET.fromstring(xml_data)
-    ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
-    paragraphs = []
-    for para in root.findall(".//w:p", ns):
-        texts = [node.text for node in para.findall(".//w:t", ns) if node.text]
-        if texts:
-            paragraphs.append("".join(texts))
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as stream:
+        paragraphs = [text for text in _iter_docx_paragraphs(stream) if text]
     return "\n".join(paragraphs)
 
 
@@ -104,8 +143,10 @@ def _collect_sections(lines: list[str]) -> dict[str, list[str]]:
             sections.setdefault(current, [])
             continue
         stripped = line.strip().rstrip(":").lower()
-        if any(stripped.startswith(name) for name in SECTION_NAMES):
-            current = next((name for name in SECTION_NAMES if stripped.startswith(name)), stripped)
+        # Tuple startswith is one C-level call; only section lines pay for
+        # the second scan that recovers which name matched.
+        if stripped.startswith(_SECTION_NAMES_SORTED):
+            current = next(name for name in _SECTION_NAMES_SORTED if stripped.startswith(name))
             sections.setdefault(current, [])
             continue
         if current is not None:
@@ -113,6 +154,14 @@ def _collect_sections(lines: list[str]) -> dict[str, list[str]]:
     return sections
 
 
+def _extract_mission(lines: list[str]) -> str:
+    for line in lines:
+        m = MISSION_RE.search(line)
+        if m:
+            return m.group(1).strip()
+    return ""
+
+
 def _find_section(sections: dict[str, list[str]], keyword: str) -> list[str]:
     for key, lines in sections.items():
         if keyword in key:
@@ -121,31 +170,20 @@ def _find_section(sections: dict[str, list[str]], keyword: str) -> list[str]:
 
 
 def _parse_sessions(raw: str) -> list[dict]:
-    lines = raw.splitlines()
-    indices = []
-    for idx, line in enumerate(lines):
-        if SESSION_RE.match(line):
-            indices.append(idx)
+    matches = list(SESSION_RE.finditer(raw))
     sessions = []
-    for i, start in enumerate(indices):
-        end = indices[i + 1] if i + 1 < len(indices) else len(lines)
-        header = lines[start]
-        m = SESSION_RE.match(header)
-        if not m:
-            continue
-        session_num = int(m.group(1))
-        title = m.group(2).strip()
-        body_lines = lines[start + 1 : end]
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(raw)
         sessions.append({
-            "session": session_num,
-            "title": title,
-            "body_lines": body_lines,
+            "session": int(m.group(1)),
+            "title": m.group(2).strip(),
+            "body_lines": raw[m.end() + 1 : end].splitlines(),
         })
     return sessions
 
 
 def _has_session_headers(raw: str) -> bool:
-    return any(SESSION_RE.match(line) for line in raw.splitlines())
+    return SESSION_RE.search(raw) is not None
 
 
 def _parse_overview(raw: str) -> dict:
@@ -154,6 +192,8 @@ def _parse_overview(raw: str) -> dict:
     for line in raw.splitlines():
         if line.startswith("# ") and not title:
             title = line[2:].strip()
+        if ":" not in line:
+            continue
         m = META_RE.match(line.strip())
         if m:
             key = m.group(1).strip().lower()
@@ -169,13 +209,13 @@ def _derive_duration_and_sessions(meeting_time: str) -> tuple[int | None, int |
     meeting_time = meeting_time.lower()
     minutes = None
     sessions = None
-    m = re.search(r"(\d+)\s*(hour|hours|hr|hrs)", meeting_time)
+    m = HOURS_RE.search(meeting_time)
     if m:
         minutes = int(m.group(1)) * 60
-    m = re.search(r"(\d+)\s*(minute|minutes|min|mins)", meeting_time)
+    m = MINUTES_RE.search(meeting_time)
     if m:
         minutes = int(m.group(1))
-    m = re.search(r"for\s+(\d+)\s+weeks", meeting_time)
+    m = WEEKS_RE.search(meeting_time)
     if m:
         sessions = int(m.group(1))
     return minutes, sessions
@@ -193,66 +233,124 @@ def _build_lesson_front_matter(
     extensions: list[str],
     teacher_prep: list[str],
 ) -> str:
-    lesson_slug = f"s{session_num:02d}-{_slugify(title)}"
-    out = "---\n"
-    out += f"course: {course_slug}\n"
-    out += f"session: {session_num}\n"
-    out += f"slug: {lesson_slug}\n"
-    out += f"title: {_yaml_quote(title)}\n"
-    out += f"duration_minutes: {duration}\n"
+    data: dict = {
+        "course": course_slug,
+        "session": session_num,
+        "slug": f"s{session_num:02d}-{_slugify(title)}",
+        "title": title,
+        "duration_minutes": duration,
+    }
     if mission:
-        out += f"makes: {_yaml_quote(mission)}\n"
-    out += _yaml_list("needs", needs)
-    out += _yaml_list("done_looks_like", checkpoints)
+        data["makes"] = mission
+    if needs:
+        data["needs"] = needs
+    if checkpoints:
+        data["done_looks_like"] = checkpoints
     if quick_fixes:
-        out += "help:\n"
-        out += _yaml_list("quick_fixes", quick_fixes, indent=2)
-    out += _yaml_list("extend", extensions)
+        data["help"] = {"quick_fixes": quick_fixes}
+    if extensions:
+        data["extend"] = extensions
     if teacher_prep:
-        out += "teacher_panel:\n"
-        out += _yaml_list("prep", teacher_prep, indent=2)
-    out += "---\n"
-    return out
+        data["teacher_panel"] = {"prep": teacher_prep}
+    return f"---\n{_dump_yaml(data)}---\n"
+
+
+def _section_bullets(
+    sections: dict[str, list[str]],
+) -> tuple[list[str], list[str], list[str], list[str], list[str]]:
+    """Return (needs, checkpoints, quick_fixes, extensions, teacher_prep)."""
+    needs_items = _extract_bullets(_find_section(sections, "materials"))
+    checkpoints = _extract_bullets(_find_section(sections, "checkpoints"))
+    quick_fixes = _extract_bullets(_find_section(sections, "common stuck points"))
+    if not quick_fixes:
+        quick_fixes = _extract_bullets(_find_section(sections, "stuck points"))
+    extensions = _extract_bullets(_find_section(sections, "extensions"))
+    teacher_prep = _extract_bullets(_find_section(sections, "teacher prep"))
+    return needs_items, checkpoints, quick_fixes, extensions, teacher_prep
+
+
+@dataclass
+class ParsedSession:
+    session: int
+    title: str
+    body_lines: list[str]
+    mission: str
+    needs: list[str]
+    checkpoints: list[str]
+    quick_fixes: list[str]
+    extensions: list[str]
+    teacher_prep: list[str]
+
+    @property
+    def lesson_slug(self) -> str:
+        return f"s{self.session:02d}-{_slugify(self.title)}"
+
+    @property
+    def filename(self) -> str:
+        return f"{self.session:02d}-{_slugify(self.title)}.md"
+
+
+def _parse_session(session: dict) -> ParsedSession:
+    """Run the per-session extraction once so preview and write share it."""
+    body_lines = session["body_lines"]
+    return ParsedSession(
+        session["session"],
+        session["title"],
+        body_lines,
+        _extract_mission(body_lines),
+        *_section_bullets(_collect_sections(body_lines)),
+    )
+
+
+def _session_front_matter(course_slug: str, parsed: ParsedSession, duration: int) -> str:
+    return _build_lesson_front_matter(
+        course_slug,
+        parsed.session,
+        parsed.title,
+        duration,
+        parsed.mission,
+        parsed.needs,
+        parsed.checkpoints,
+        parsed.quick_fixes,
+        parsed.extensions,
+        parsed.teacher_prep,
+    )
 
 
 def _render_course_yaml(
     slug: str,
     title: str,
-    sessions: list[dict],
+    sessions: list[ParsedSession],
     duration: int,
     age_band: str,
     needs: list[str],
 ) -> str:
-    lesson_entries = []
-    for session in sessions:
-        session_num = session["session"]
-        lesson_title = session["title"]
-        lesson_slug = f"s{session_num:02d}-{_slugify(lesson_title)}"
-        filename = f"{session_num:02d}-{_slugify(lesson_title)}.md"
-        lesson_entries.append(
-            f"""  - session: {session_num}
-    slug: {lesson_slug}
-    title: {_yaml_quote(lesson_title)}
-    file: lessons/{filename}"""
-        )
-
-    course_yaml = f"""slug: {slug}
-title: {_yaml_quote(title)}
-sessions: {len(sessions)}
-default_duration_minutes: {duration}
-age_band: {_yaml_quote(age_band)}
-{_yaml_list("needs", needs).rstrip()}
-helper_reference: {slug}
-lessons:
-{chr(10).join(lesson_entries)}
-"""
-    return course_yaml
+    data: dict = {
+        "slug": slug,
+        "title": title,
+        "sessions": len(sessions),
+        "default_duration_minutes": duration,
+        "age_band": age_band,
+    }
+    if needs:
+        data["needs"] = needs
+    data["helper_reference"] = slug
+    data["lessons"] = [
+        {
+            "session": session.session,
+            "slug": session.lesson_slug,
+            "title": session.title,
+            "file": f"lessons/{session.filename}",
+        }
+        for session in sessions
+    ]
+    return _dump_yaml(data)
 
 
 def _write_course(
     slug: str,
     title: str,
-    sessions: list[dict],
+    sessions: list[ParsedSession],
     duration: int,
     age_band: str,
     needs: list[str],
@@ -263,49 +361,23 @@ def _write_course(
     lessons_dir.mkdir(parents=True, exist_ok=True)
 
     for session in sessions:
-        session_num = session["session"]
-        lesson_title = session["title"]
-        lesson_slug = f"s{session_num:02d}-{_slugify(lesson_title)}"
-        filename = f"{session_num:02d}-{_slugify(lesson_title)}.md"
-
-        body_lines = session["body_lines"]
-        mission = ""
-        for line in body_lines:
-            m = re.search(r"(?:\*{0,2})Mission(?:\*{0,2})\s*:\s*(.+)", line, re.I)
-            if m:
-                mission = m.group(1).strip()
-                break
-
-        sections = _collect_sections(body_lines)
-        needs_items = _extract_bullets(_find_section(sections, "materials"))
-        checkpoints = _extract_bullets(_find_section(sections, "checkpoints"))
-        quick_fixes = _extract_bullets(_find_section(sections, "common stuck points"))
-        if not quick_fixes:
-            quick_fixes = _extract_bullets(_find_section(sections, "stuck points"))
-        extensions = _extract_bullets(_find_section(sections, "extensions"))
-        teacher_prep = _extract_bullets(_find_section(sections, "teacher prep"))
-
-        front_matter = _build_lesson_front_matter(
-            slug,
-            session_num,
-            lesson_title,
-            duration,
-            mission,
-            needs_items,
-            checkpoints,
-            quick_fixes,
-            extensions,
-            teacher_prep,
-        )
-
-        body = "\n".join(body_lines).strip() + "\n"
-        (lessons_dir / filename).write_text(front_matter + body, encoding="utf-8")
+        front_matter = _session_front_matter(slug, session, duration)
+        body = "\n".join(session.body_lines).strip() + "\n"
+        (lessons_dir / session.filename).write_bytes((front_matter + body).encode("utf-8"))
 
     course_yaml = _render_course_yaml(slug, title, sessions, duration, age_band, needs)
-    (course_dir / "course.yaml").write_text(course_yaml, encoding="utf-8")
+    (course_dir / "course.yaml").write_bytes(course_yaml.encode("utf-8"))
     return course_dir
 
 
+def _dir_has_entries(path: Path) -> bool:
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except FileNotFoundError:
+        return False
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--sessions-md", required=True)
@@ -323,7 +395,7 @@ def main() -> int:
     sessions_raw = _read_text(sessions_path)
     if not _has_session_headers(sessions_raw):
         print("[warn] No session headers found. Expected lines like: 'Session 01: Title'.")
-    sessions = _parse_sessions(sessions_raw)
+    sessions = [_parse_session(session) for session in _parse_sessions(sessions_raw)]
     if not sessions:
         raise SystemExit("No sessions found. Expected headings like: Session 01: Title")
 
@@ -346,45 +418,16 @@ def main() -> int:
         needs.append(overview_info["platform"])
 
     course_dir = COURSES_ROOT / args.slug
-    if course_dir.exists() and any(course_dir.iterdir()) and not args.force:
+    if _dir_has_entries(course_dir) and not args.force:
         raise SystemExit(f"Course folder already exists: {course_dir} (use --force to overwrite)")
 
     if args.dry_run:
         print("[dry-run] course.yaml:")
         print(_render_course_yaml(args.slug, title, sessions, duration, age_band, needs))
         for session in sessions:
-            session_num = session["session"]
-            lesson_title = session["title"]
-            filename = f"{session_num:02d}-{_slugify(lesson_title)}.md"
-            body_lines = session["body_lines"]
-            mission = ""
-            for line in body_lines:
-                m = re.search(r"(?:\*{0,2})Mission(?:\*{0,2})\s*:\s*(.+)", line, re.I)
-                if m:
-                    mission = m.group(1).strip()
-                    break
-            sections = _collect_sections(body_lines)
-            needs_items = _extract_bullets(_find_section(sections, "materials"))
-            checkpoints = _extract_bullets(_find_section(sections, "checkpoints"))
-            quick_fixes = _extract_bullets(_find_section(sections, "common stuck points"))
-            if not quick_fixes:
-                quick_fixes = _extract_bullets(_find_section(sections, "stuck points"))
-            extensions = _extract_bullets(_find_section(sections, "extensions"))
-            teacher_prep = _extract_bullets(_find_section(sections, "teacher prep"))
-            front_matter = _build_lesson_front_matter(
-                args.slug,
-                session_num,
-                lesson_title,
-                duration,
-                mission,
-                needs_items,
-                checkpoints,
-                quick_fixes,
-                extensions,
-                teacher_prep,
-            )
-            print(f"[dry-run] lessons/{filename}:")
-            print(front_matter + "\n".join(body_lines).strip())
+            front_matter = _session_front_matter(args.slug, session, duration)
+            print(f"[dry-run] lessons/{session.filename}:")
+            print(front_matter + "\n".join(session.body_lines).strip())
         return 0
 
     _write_course(args.slug, title, sessions, duration, age_band, needs)
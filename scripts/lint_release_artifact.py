@@ -49,7 +49,7 @@ def _is_forbidden(path: str) -> bool:
         return True
     if normalized.startswith("compose/.env.") and normalized != "compose/.env.example":
         return True
-    if any(normalized.startswith(prefix) for prefix in BLOCKED_PREFIXES):
+    if normalized.startswith(BLOCKED_PREFIXES):
         return True
     if normalized.endswith(BLOCKED_SUFFIXES):
         return True
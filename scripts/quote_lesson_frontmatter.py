@@ -3,10 +3,17 @@
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 
 TARGET = Path("services/classhub/content/courses")
+_SKIP_FIRST = frozenset("\"'|>[{")
+_QUOTE_ESCAPE = str.maketrans({'"': '\\"'})
+# Cheap pre-checks mirroring _quote_frontmatter/_quote_line, so lessons that are
+# already clean are never split into lines.
+_FENCE_RE = re.compile(r"^[^\S\n]*---[^\S\n]*$", re.M)
+_NEEDS_QUOTE_RE = re.compile(r"^(?![^\S\n]*-)[^:\n]*:[^\S\n]*(?::|[^\s\"'|>\[{][^\n]*:)", re.M)
 
 
 def _quote_line(line: str) -> str:
@@ -18,16 +25,28 @@ def _quote_line(line: str) -> str:
     value = suffix.strip()
     if (
         not value
-        or value[0] in ('"', "'", "|", ">", "[", "{")
+        or value[0] in _SKIP_FIRST
         or ":" not in value
     ):
         return line
 
     leading_spaces = suffix[: len(suffix) - len(suffix.lstrip())]
-    escaped = value.replace('"', '\\"')
+    escaped = value.translate(_QUOTE_ESCAPE) if '"' in value else value
     return f"{prefix}:{leading_spaces}\"{escaped}\""
 
 
+def _needs_quoting(text: str) -> bool:
+    if not text.startswith("---"):
+        return False
+    start = text.find("\n") + 1
+    if not start:
+        return False
+    fence = _FENCE_RE.search(text, start)
+    if fence is None:
+        return False
+    return _NEEDS_QUOTE_RE.search(text, start, fence.start()) is not None
+
+
 def _quote_frontmatter(text: str) -> str:
     if not text.startswith("---"):
         return text
@@ -48,7 +67,10 @@ def _quote_frontmatter(text: str) -> str:
     after = lines[end_idx:]
 
     quoted = [_quote_line(line) for line in fm_lines]
-    return "\n".join([before[0]] + quoted + after)
+    new_text = "\n".join([before[0]] + quoted + after)
+    if text.endswith("\n"):
+        new_text += "\n"
+    return new_text
 
 
 def main() -> int:
@@ -59,9 +81,11 @@ def main() -> int:
             continue
         for lesson in sorted(lessons_dir.glob("*.md")):
             text = lesson.read_text(encoding="utf-8")
+            if not _needs_quoting(text):
+                continue
             new_text = _quote_frontmatter(text)
             if new_text != text:
-                lesson.write_text(new_text, encoding="utf-8")
+                lesson.write_bytes(new_text.encode("utf-8"))
                 modified.append(lesson)
 
     if modified:
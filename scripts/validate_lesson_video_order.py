@@ -19,15 +19,19 @@ from __future__ import annotations
 
 import argparse
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-SESSION_RE = re.compile(r"^session:\s*(\d+)\s*$", re.M)
-VIDEO_ID_RE = re.compile(r"^\s*-\s*id:\s*(V\d+)\s*$", re.M)
+# One pass over the front matter collects both `session:` and `- id: Vnn` lines.
+FRONT_MATTER_RE = re.compile(r"^(?:session:\s*(\d+)|\s*-\s*id:\s*(V\d+))\s*$", re.M)
 WATCH_VIDEO_RE = re.compile(r"^###\s+(V\d+)\b", re.M)
 H2_RE = re.compile(r"^##\s+")
 WATCH_HEADER_RE = re.compile(r"^\s*###\s+(V\d+)\b")
 WATCH_SECTION_RE = re.compile(r"^##\s+Watch\s*$", re.M | re.I)
+# Superset of the `## watch` line test below; lets bodies without one skip splitlines.
+WATCH_HINT_RE = re.compile(r"## watch", re.I)
+READ_WORKERS = 8
 
 
 def _video_num(video_id: str) -> int:
@@ -38,15 +42,41 @@ def _split_doc(text: str) -> tuple[str, str, str]:
     """Return (front_block, front_matter, body)."""
     if not text.startswith("---"):
         return "", "", text
-    parts = text.split("---", 2)
-    if len(parts) < 3:
+    end = text.find("\n---", 3)
+    if end < 0:
         return "", "", text
-    front_block = "---" + parts[1] + "---"
-    return front_block, parts[1], parts[2]
+    fm_end = end + 1
+    close_end = fm_end + 3
+    return text[:close_end], text[3:fm_end], text[close_end:]
+
+
+def _read_lesson(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def _read_lessons(paths: list[Path]) -> list[str]:
+    """Read lesson files concurrently; results keep the order of `paths`."""
+    if len(paths) < 2:
+        return [_read_lesson(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(paths))) as pool:
+        return list(pool.map(_read_lesson, paths))
+
+
+def _watch_id(line: str) -> str | None:
+    # Cheap substring gate so ordinary prose lines never enter the regex engine.
+    if "###" not in line:
+        return None
+    m = WATCH_HEADER_RE.match(line)
+    return m.group(1) if m else None
+
+
+def _is_h2(line: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith("##") and H2_RE.match(stripped) is not None
 
 
 def _sync_watch_section(body: str, lesson_videos: list[str]) -> tuple[str, bool]:
-    lines = body.splitlines(keepends=True)
+    lines = body.splitlines(keepends=True) if WATCH_HINT_RE.search(body) else []
     watch_idx = next((i for i, line in enumerate(lines) if line.strip().lower() == "## watch"), None)
     if watch_idx is None:
         if not lesson_videos:
@@ -57,23 +87,19 @@ def _sync_watch_section(body: str, lesson_videos: list[str]) -> tuple[str, bool]
             tail += f"### {vid}\n\n"
         return body + tail, True
 
-    end_idx = len(lines)
-    for i in range(watch_idx + 1, len(lines)):
-        if H2_RE.match(lines[i].strip()):
-            end_idx = i
-            break
+    end_idx = next((i for i in range(watch_idx + 1, len(lines)) if _is_h2(lines[i])), len(lines))
 
-    section = lines[watch_idx + 1 : end_idx]
     pre_lines: list[str] = []
     blocks: dict[str, list[str]] = {}
     block_order: list[str] = []
     current_vid = ""
     saw_block = False
 
-    for line in section:
-        m = WATCH_HEADER_RE.match(line)
-        if m:
-            current_vid = m.group(1)
+    for i in range(watch_idx + 1, end_idx):
+        line = lines[i]
+        vid = _watch_id(line)
+        if vid:
+            current_vid = vid
             if current_vid not in blocks:
                 blocks[current_vid] = []
                 block_order.append(current_vid)
@@ -99,7 +125,7 @@ def _sync_watch_section(body: str, lesson_videos: list[str]) -> tuple[str, bool]
         if vid not in lesson_videos:
             rebuilt.extend(blocks[vid])
 
-    if section == rebuilt:
+    if lines[watch_idx + 1 : end_idx] == rebuilt:
         return body, False
 
     new_lines = lines[: watch_idx + 1] + rebuilt + lines[end_idx:]
@@ -122,16 +148,21 @@ def main() -> int:
     lesson_copy_errors: list[str] = []
     fixed_files: list[str] = []
 
-    for path in sorted(lessons_dir.glob("*.md")):
-        raw = path.read_text(encoding="utf-8")
+    paths = sorted(lessons_dir.glob("*.md"))
+    for path, raw in zip(paths, _read_lessons(paths)):
         front_block, fm, body = _split_doc(raw)
         if not fm:
             continue
-        m = SESSION_RE.search(fm)
-        if not m:
+        session = None
+        lesson_videos: list[str] = []
+        for m in FRONT_MATTER_RE.finditer(raw, 3, 3 + len(fm)):
+            if m.group(1) is not None:
+                if session is None:
+                    session = int(m.group(1))
+            else:
+                lesson_videos.append(m.group(2))
+        if session is None:
             continue
-        session = int(m.group(1))
-        lesson_videos = VIDEO_ID_RE.findall(fm)
 
         if args.fix_watch_sync:
             new_body, changed = _sync_watch_section(body, lesson_videos)
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django_otp.admin import OTPAdminSite
+from hub.services.otp import is_otp_verified
 
 
 class ClassHubAdminSite(OTPAdminSite):
@@ -14,5 +15,4 @@ class ClassHubAdminSite(OTPAdminSite):
             return False
         if not bool(getattr(settings, "ADMIN_2FA_REQUIRED", True)):
             return True
-        is_verified = getattr(user, "is_verified", None)
-        return bool(is_verified() if callable(is_verified) else False)
+        return is_otp_verified(request)
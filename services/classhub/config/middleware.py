@@ -1,7 +1,27 @@
-from urllib.parse import urlencode
+import json
+import sys
+from types import MappingProxyType
+from urllib.parse import quote_plus
 
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import HttpResponse, HttpResponseRedirect
+from hub.services.otp import is_otp_verified
+from hub.views import healthz
+
+
+# Header tokens compared on every site-mode check; interned once at import.
+_JSON_MEDIA_TYPE = sys.intern("application/json")
+_XHR_HEADER_VALUE = sys.intern("xmlhttprequest")
+
+_TEACHER_2FA_SETUP_URL = "/teach/2fa/setup"
+
+_DEFAULT_SITE_MODE_MESSAGES = MappingProxyType(
+    {
+        "read-only": "Class Hub is in read-only mode. Uploads and write actions are temporarily disabled.",
+        "join-only": "Class Hub is in join-only mode. Class entry is available; teaching and upload actions are paused.",
+        "maintenance": "Class Hub is in maintenance mode. Please try again shortly.",
+    }
+)
 
 
 class SecurityHeadersMiddleware:
@@ -9,80 +29,114 @@ class SecurityHeadersMiddleware:
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Settings are fixed for the life of the process, so resolve the
+        # header values once instead of on every response.
+        self._headers = tuple(
+            (header, value)
+            for header, value in (
+                ("Content-Security-Policy", self._setting("CSP_POLICY")),
+                ("Content-Security-Policy-Report-Only", self._setting("CSP_REPORT_ONLY_POLICY")),
+                ("Permissions-Policy", self._setting("PERMISSIONS_POLICY")),
+            )
+            if value
+        )
+
+    @staticmethod
+    def _setting(name: str) -> str:
+        return (getattr(settings, name, "") or "").strip()
 
     def __call__(self, request):
         response = self.get_response(request)
-        csp_policy = (getattr(settings, "CSP_POLICY", "") or "").strip()
-        if csp_policy and "Content-Security-Policy" not in response:
-            response["Content-Security-Policy"] = csp_policy
-        csp_report_only = (getattr(settings, "CSP_REPORT_ONLY_POLICY", "") or "").strip()
-        if csp_report_only and "Content-Security-Policy-Report-Only" not in response:
-            response["Content-Security-Policy-Report-Only"] = csp_report_only
-        permissions_policy = (getattr(settings, "PERMISSIONS_POLICY", "") or "").strip()
-        if permissions_policy and "Permissions-Policy" not in response:
-            response["Permissions-Policy"] = permissions_policy
-        referrer_policy = (
-            getattr(settings, "SECURITY_REFERRER_POLICY", None)
-            or getattr(settings, "SECURE_REFERRER_POLICY", "")
-            or ""
-        ).strip()
-        if referrer_policy and "Referrer-Policy" not in response:
-            response["Referrer-Policy"] = referrer_policy
-        x_frame_options = (getattr(settings, "X_FRAME_OPTIONS", "") or "").strip()
-        if x_frame_options and "X-Frame-Options" not in response:
-            response["X-Frame-Options"] = x_frame_options
+        for header, value in self._headers:
+            if header not in response:
+                response[header] = value
         return response
 
 
+class FastPathMiddleware:
+    """Answer liveness probes without running the session/auth stack.
+
+    Static files never reach this point: WhiteNoise, installed just above,
+    serves them directly.
+    """
+
+    _HEALTHZ_PATHS = frozenset(map(sys.intern, ("/healthz",)))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path in self._HEALTHZ_PATHS:
+            return healthz(request)
+        return self.get_response(request)
+
+
 class TeacherOTPRequiredMiddleware:
     """Require OTP-verified staff sessions for /teach routes."""
 
     _EXEMPT_PREFIXES = (
-        "/teach/2fa/setup",
+        _TEACHER_2FA_SETUP_URL,
         "/teach/logout",
     )
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Like Django's own middleware, settings are read once; a restart
+        # is required to toggle TEACHER_2FA_REQUIRED.
+        self._enabled = bool(getattr(settings, "TEACHER_2FA_REQUIRED", True))
 
     def __call__(self, request):
-        if not getattr(settings, "TEACHER_2FA_REQUIRED", True):
-            return self.get_response(request)
-
         path = request.path or ""
-        if not path.startswith("/teach"):
+        if not self._enabled or not path.startswith("/teach"):
             return self.get_response(request)
-        if any(path.startswith(prefix) for prefix in self._EXEMPT_PREFIXES):
+        if path.startswith(self._EXEMPT_PREFIXES):
             return self.get_response(request)
 
         user = getattr(request, "user", None)
         if not user or not user.is_authenticated or not user.is_staff:
             return self.get_response(request)
 
-        is_verified_attr = getattr(user, "is_verified", None)
-        is_verified = bool(is_verified_attr() if callable(is_verified_attr) else is_verified_attr)
-        if is_verified:
+        if is_otp_verified(request):
             return self.get_response(request)
 
         next_path = request.get_full_path()
-        params = urlencode({"next": next_path}) if next_path else ""
-        destination = "/teach/2fa/setup"
-        if params:
-            destination = f"{destination}?{params}"
-        return HttpResponseRedirect(destination)
+        if not next_path:
+            return HttpResponseRedirect(_TEACHER_2FA_SETUP_URL)
+        # quote_plus matches what urlencode({"next": ...}) produced.
+        return HttpResponseRedirect(f"{_TEACHER_2FA_SETUP_URL}?next={quote_plus(next_path)}")
 
 
 class SiteModeMiddleware:
     """Gate high-impact routes when operator enables a degraded site mode."""
 
-    _SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
-    _JOIN_ONLY_ALLOWED_EXACT = {"/", "/join", "/student", "/logout", "/healthz"}
+    _SAFE_METHODS = frozenset(map(sys.intern, ("GET", "HEAD", "OPTIONS")))
+    _JOIN_ONLY_ALLOWED_EXACT = frozenset(map(sys.intern, ("/", "/join", "/student", "/logout", "/healthz")))
     _JOIN_ONLY_ALLOWED_PREFIXES = ("/course/", "/lesson-video/", "/lesson-asset/", "/static/")
-    _MAINTENANCE_ALLOWED_EXACT = {"/healthz"}
+    _MAINTENANCE_ALLOWED_EXACT = frozenset(map(sys.intern, ("/healthz",)))
     _MAINTENANCE_ALLOWED_PREFIXES = ("/admin/", "/teach", "/static/")
+    _READ_ONLY_ALLOWED_PREFIXES = ("/admin/", "/internal/events/", _TEACHER_2FA_SETUP_URL)
+    _BLOCKED_HEADERS = {"Retry-After": "120", "Cache-Control": "no-store"}
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # SITE_MODE is read from the environment at startup; changing it
+        # requires a process restart, so resolve the per-mode check once.
+        self._mode = self._site_mode()
+        self._blocks = {
+            "read-only": self._read_only_blocks,
+            "join-only": self._join_only_blocks,
+            "maintenance": self._maintenance_blocks,
+        }.get(self._mode)
+        # Blocked responses depend only on the mode, so serialize both bodies once.
+        message = self._mode_message(self._mode)
+        self._json_body = json.dumps(
+            {
+                "error": "site_mode_restricted",
+                "site_mode": self._mode,
+                "message": message,
+            }
+        ).encode("utf-8")
+        self._text_body = message.encode("utf-8")
 
     @staticmethod
     def _site_mode() -> str:
@@ -92,83 +146,63 @@ class SiteModeMiddleware:
     @staticmethod
     def _mode_message(mode: str) -> str:
         override = (getattr(settings, "SITE_MODE_MESSAGE", "") or "").strip()
-        if override:
-            return override
-        if mode == "read-only":
-            return "Class Hub is in read-only mode. Uploads and write actions are temporarily disabled."
-        if mode == "join-only":
-            return "Class Hub is in join-only mode. Class entry is available; teaching and upload actions are paused."
-        if mode == "maintenance":
-            return "Class Hub is in maintenance mode. Please try again shortly."
-        return ""
+        return override or _DEFAULT_SITE_MODE_MESSAGES.get(mode, "")
 
     @staticmethod
-    def _wants_json(request) -> bool:
-        path = (request.path or "").strip()
-        accept = (request.headers.get("Accept", "") or "").lower()
-        content_type = (request.headers.get("Content-Type", "") or "").lower()
-        return (
-            path == "/join"
-            or "application/json" in accept
-            or "application/json" in content_type
-            or (request.headers.get("X-Requested-With", "") or "").lower() == "xmlhttprequest"
-        )
+    def _wants_json(request, path: str) -> bool:
+        # Cheapest check first; each header is read and lowercased at most once
+        # (media types are case-insensitive) and only if the earlier ones miss.
+        if path == "/join":
+            return True
+        headers = request.headers
+        if _JSON_MEDIA_TYPE in headers.get("Accept", "").lower():
+            return True
+        if headers.get("X-Requested-With", "").lower() == _XHR_HEADER_VALUE:
+            return True
+        return _JSON_MEDIA_TYPE in headers.get("Content-Type", "").lower()
 
     @classmethod
     def _join_only_allows(cls, path: str) -> bool:
         if path in cls._JOIN_ONLY_ALLOWED_EXACT:
             return True
-        return any(path.startswith(prefix) for prefix in cls._JOIN_ONLY_ALLOWED_PREFIXES)
+        return path.startswith(cls._JOIN_ONLY_ALLOWED_PREFIXES)
 
     @classmethod
     def _maintenance_allows(cls, path: str) -> bool:
         if path in cls._MAINTENANCE_ALLOWED_EXACT:
             return True
-        return any(path.startswith(prefix) for prefix in cls._MAINTENANCE_ALLOWED_PREFIXES)
+        return path.startswith(cls._MAINTENANCE_ALLOWED_PREFIXES)
 
     @classmethod
-    def _read_only_blocks(cls, request) -> bool:
-        path = (request.path or "").strip()
-        method = (request.method or "GET").upper()
-        if path.startswith("/admin/"):
-            return False
-        if path.startswith("/internal/events/"):
-            return False
-        if path.startswith("/teach/2fa/setup"):
+    def _join_only_blocks(cls, request, path: str) -> bool:
+        return not cls._join_only_allows(path)
+
+    @classmethod
+    def _maintenance_blocks(cls, request, path: str) -> bool:
+        return not cls._maintenance_allows(path)
+
+    @classmethod
+    def _read_only_blocks(cls, request, path: str) -> bool:
+        if path.startswith(cls._READ_ONLY_ALLOWED_PREFIXES):
             return False
         if path.startswith("/material/") and path.endswith("/upload"):
             return True
-        if method not in cls._SAFE_METHODS and path != "/join":
-            return True
-        return False
-
-    def _blocked_response(self, request, *, mode: str):
-        message = self._mode_message(mode)
-        if self._wants_json(request):
-            response = JsonResponse(
-                {
-                    "error": "site_mode_restricted",
-                    "site_mode": mode,
-                    "message": message,
-                },
-                status=503,
-            )
+        # Django's WSGI and ASGI handlers both uppercase request.method.
+        return request.method not in cls._SAFE_METHODS and path != "/join"
+
+    def _blocked_response(self, request, path: str):
+        if self._wants_json(request, path):
+            body, content_type = self._json_body, _JSON_MEDIA_TYPE
         else:
-            response = HttpResponse(message, status=503, content_type="text/plain; charset=utf-8")
-        response["Retry-After"] = "120"
-        response["Cache-Control"] = "no-store"
-        return response
+            body, content_type = self._text_body, "text/plain; charset=utf-8"
+        return HttpResponse(body, status=503, content_type=content_type, headers=self._BLOCKED_HEADERS)
 
     def __call__(self, request):
-        mode = self._site_mode()
-        if mode == "normal":
+        if self._blocks is None:
             return self.get_response(request)
 
-        path = (request.path or "").strip()
-        if mode == "read-only" and self._read_only_blocks(request):
-            return self._blocked_response(request, mode=mode)
-        if mode == "join-only" and not self._join_only_allows(path):
-            return self._blocked_response(request, mode=mode)
-        if mode == "maintenance" and not self._maintenance_allows(path):
-            return self._blocked_response(request, mode=mode)
+        # Django builds request.path from the URL; it is never padded.
+        path = request.path
+        if self._blocks(request, path):
+            return self._blocked_response(request, path)
         return self.get_response(request)
@@ -20,20 +20,25 @@ import environ
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Every env(...) read below runs once, when settings are imported at worker
+# start; nothing here is re-parsed per request. django-environ stays the single
+# parsing path (its bool/int coercion and env.db URL parsing) for consistency.
+env = environ.Env(
+    DJANGO_DEBUG=(bool, False),
+)
+
 # Repo-authored curriculum content lives inside the Django build context so it
-# ships with the container image.
+# ships with the container image. Other modules should use these paths rather
+# than re-deriving them from BASE_DIR.
 #
 # Layout:
 #   services/classhub/content/courses/<course_slug>/course.yaml
 #   services/classhub/content/courses/<course_slug>/lessons/*.md
-env = environ.Env(
-    DJANGO_DEBUG=(bool, False),
-)
-
-# Repo-authored content packs live under:
-#   services/classhub/content/courses/<course_slug>/...
 CONTENT_ROOT = BASE_DIR / "content"
 CONTENT_COURSES_ROOT = CONTENT_ROOT / "courses"
+# How long a course/lesson file's mtime check is reused before stat() runs
+# again; edits on disk show up within this window. 0 stats on every request.
+CLASSHUB_CONTENT_STAT_TTL_SECONDS = env.float("CLASSHUB_CONTENT_STAT_TTL_SECONDS", default=1.0)
 
 DEBUG = env.bool("DJANGO_DEBUG", default=False)
 SECRET_KEY = env("DJANGO_SECRET_KEY", default="").strip()
@@ -107,8 +112,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Kept outside the short-circuiting middleware below so every response,
+    # including static files and health probes, gets the framing header.
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "config.middleware.SecurityHeadersMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Answers /healthz before sessions/auth/messages run.
+    "config.middleware.FastPathMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -117,7 +127,6 @@ MIDDLEWARE = [
     "config.middleware.TeacherOTPRequiredMiddleware",
     "config.middleware.SiteModeMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # StudentSessionMiddleware relies on sessions.
     "hub.middleware.StudentSessionMiddleware",
 ]
@@ -145,6 +154,32 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": env.db(default=f"sqlite:///{BASE_DIR/'db.sqlite3'}")
 }
+# Student pages touch the DB on every request (session lookup, heartbeat,
+# events), so keep connections open across requests; health checks drop a
+# connection Postgres has closed before it is reused.
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("DJANGO_DB_CONN_MAX_AGE", default=60)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+# Set when connecting through PgBouncer in transaction-pooling mode: named
+# server-side cursors (QuerySet.iterator) cannot outlive a pooled transaction.
+DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = env.bool(
+    "DJANGO_DB_DISABLE_SERVER_SIDE_CURSORS", default=False
+)
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Local/demo SQLite: class hub writes events and submissions while pages
+    # are being read, so WAL lets readers proceed during writes and IMMEDIATE
+    # avoids lock-upgrade deadlocks. Back up the -wal/-shm files together with
+    # db.sqlite3 (or checkpoint first).
+    DATABASES["default"].setdefault("OPTIONS", {}).update(
+        {
+            "transaction_mode": "IMMEDIATE",
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA mmap_size=268435456;"
+            ),
+        }
+    )
 
 REDIS_URL = os.getenv("REDIS_URL", "").strip()
 if REDIS_URL:
@@ -155,6 +190,11 @@ if REDIS_URL:
             "LOCATION": REDIS_URL,
         }
     }
+    # Serve student/teacher sessions from Redis and only fall back to the
+    # database on a cache miss. Writes still go through to the database, so a
+    # Redis restart does not log anyone out.
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    SESSION_CACHE_ALIAS = "default"
 else:
     # Fallback path: single-process in-memory cache (fine for local/demo).
     CACHES = {
@@ -196,6 +236,8 @@ STORAGES = {
     "default": {
         "BACKEND": "django.core.files.storage.FileSystemStorage",
     },
+    # collectstatic writes gzip and (with the Brotli package installed) brotli
+    # variants; WhiteNoise serves whichever the client's Accept-Encoding allows.
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
@@ -251,6 +293,15 @@ CLASSHUB_ASSET_BASE_URL = env("CLASSHUB_ASSET_BASE_URL", default="").strip().rst
 REQUEST_SAFETY_TRUST_PROXY_HEADERS = env.bool("REQUEST_SAFETY_TRUST_PROXY_HEADERS", default=False)
 REQUEST_SAFETY_XFF_INDEX = env.int("REQUEST_SAFETY_XFF_INDEX", default=0)
 CLASSHUB_INTERNAL_EVENTS_TOKEN = env("CLASSHUB_INTERNAL_EVENTS_TOKEN", default="").strip()
+# Optional StudentEvent write buffering: 0 writes each event immediately; a
+# positive value batches events in-process and flushes them every N seconds
+# (or sooner once CLASSHUB_STUDENT_EVENT_BATCH_SIZE events are queued).
+CLASSHUB_STUDENT_EVENT_FLUSH_SECONDS = env.float("CLASSHUB_STUDENT_EVENT_FLUSH_SECONDS", default=0.0)
+CLASSHUB_STUDENT_EVENT_BATCH_SIZE = env.int("CLASSHUB_STUDENT_EVENT_BATCH_SIZE", default=64)
+# Same opt-in batching for staff AuditEvent rows; queued only after the
+# surrounding transaction commits.
+CLASSHUB_AUDIT_EVENT_FLUSH_SECONDS = env.float("CLASSHUB_AUDIT_EVENT_FLUSH_SECONDS", default=0.0)
+CLASSHUB_AUDIT_EVENT_BATCH_SIZE = env.int("CLASSHUB_AUDIT_EVENT_BATCH_SIZE", default=64)
 ADMIN_2FA_REQUIRED = env.bool("DJANGO_ADMIN_2FA_REQUIRED", default=True)
 TEACHER_2FA_REQUIRED = env.bool("DJANGO_TEACHER_2FA_REQUIRED", default=True)
 CSP_POLICY = env(
@@ -269,6 +320,9 @@ SECURITY_REFERRER_POLICY = (
     env("DJANGO_SECURE_REFERRER_POLICY", default="strict-origin-when-cross-origin").strip()
     or "strict-origin-when-cross-origin"
 )
+# Referrer-Policy and X-Frame-Options come from Django's SecurityMiddleware and
+# XFrameOptionsMiddleware; SecurityHeadersMiddleware only adds CSP/Permissions.
+SECURE_REFERRER_POLICY = SECURITY_REFERRER_POLICY
 X_FRAME_OPTIONS = (env("DJANGO_X_FRAME_OPTIONS", default="SAMEORIGIN").strip() or "SAMEORIGIN").upper()
 SITE_MODE = env("CLASSHUB_SITE_MODE", default="normal").strip().lower()
 if SITE_MODE in {"readonly", "read_only"}:
@@ -293,4 +347,3 @@ if not DEBUG:
     SECURE_HSTS_INCLUDE_SUBDOMAINS = env.bool("DJANGO_SECURE_HSTS_INCLUDE_SUBDOMAINS", default=False)
     SECURE_HSTS_PRELOAD = env.bool("DJANGO_SECURE_HSTS_PRELOAD", default=False)
     SECURE_CONTENT_TYPE_NOSNIFF = True
-    SECURE_REFERRER_POLICY = SECURITY_REFERRER_POLICY
@@ -9,58 +9,77 @@ Plain-language map:
 """
 
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from hub import views
 
-urlpatterns = [
-    # Admin surface (operations/configuration). Kept separate from daily teaching UI.
-    path("admin/", admin.site.urls),
+# Prefixed route groups are nested with include() so the resolver tests one
+# prefix per group instead of walking every sibling pattern in order.
+_teach_class_patterns = [
+    path("join-card", views.teach_class_join_card),
+    path("rename-student", views.teach_rename_student),
+    path("reset-roster", views.teach_reset_roster),
+    path("toggle-lock", views.teach_toggle_lock),
+    path("lock", views.teach_lock_class),
+    path("export-submissions-today", views.teach_export_class_submissions_today),
+    path("rotate-code", views.teach_rotate_code),
+    path("add-module", views.teach_add_module),
+    path("move-module", views.teach_move_module),
+]
+
+_teach_module_patterns = [
+    path("add-material", views.teach_add_material),
+    path("move-material", views.teach_move_material),
+]
 
-    # Health endpoint for reverse proxy and uptime checks.
+_teach_patterns = [
+    path("2fa/setup", views.teach_teacher_2fa_setup),
+    path("create-teacher", views.teach_create_teacher),
+    path("generate-authoring-templates", views.teach_generate_authoring_templates),
+    path("authoring-template/download", views.teach_download_authoring_template),
+    path("logout", views.teacher_logout),
+    path("lessons", views.teach_lessons),
+    path("lessons/release", views.teach_set_lesson_release),
+    path("assets", views.teach_assets),
+    path("create-class", views.teach_create_class),
+    path("class/<int:class_id>", views.teach_class_dashboard),
+    path("class/<int:class_id>/", include(_teach_class_patterns)),
+    path("videos", views.teach_videos),
+    path("module/<int:module_id>", views.teach_module),
+    path("module/<int:module_id>/", include(_teach_module_patterns)),
+    path("material/<int:material_id>/submissions", views.teach_material_submissions),
+]
+
+_course_patterns = [
+    path("<slug:course_slug>", views.course_overview),
+    path("<slug:course_slug>/<slug:lesson_slug>", views.course_lesson),
+]
+
+urlpatterns = [
+    # Health endpoint for reverse proxy and uptime checks, plus the landing
+    # page: the hottest exact routes resolve first.
     path("healthz", views.healthz),
-    path("internal/events/helper-chat-access", views.internal_helper_chat_access_event),
+    path("", views.index),
 
     # Student flow (class-code login and classroom page).
-    path("", views.index),
     path("join", views.join_class),
     path("student", views.student_home),
     path("student/portfolio-export", views.student_portfolio_export),
     path("logout", views.student_logout),
 
+    # Repo-authored course content pages (markdown rendered to HTML).
+    path("course/", include(_course_patterns)),
+
     # Student upload + shared download/stream routes.
     path("material/<int:material_id>/upload", views.material_upload),
     path("submission/<int:submission_id>/download", views.submission_download),
     path("lesson-video/<int:video_id>/stream", views.lesson_video_stream),
     path("lesson-asset/<int:asset_id>/download", views.lesson_asset_download),
 
-    # Repo-authored course content pages (markdown rendered to HTML).
-    path("course/<slug:course_slug>", views.course_overview),
-    path("course/<slug:course_slug>/<slug:lesson_slug>", views.course_lesson),
-
     # Teacher cockpit (staff-only, outside Django admin).
     path("teach", views.teach_home),
-    path("teach/2fa/setup", views.teach_teacher_2fa_setup),
-    path("teach/create-teacher", views.teach_create_teacher),
-    path("teach/generate-authoring-templates", views.teach_generate_authoring_templates),
-    path("teach/authoring-template/download", views.teach_download_authoring_template),
-    path("teach/logout", views.teacher_logout),
-    path("teach/lessons", views.teach_lessons),
-    path("teach/lessons/release", views.teach_set_lesson_release),
-    path("teach/assets", views.teach_assets),
-    path("teach/create-class", views.teach_create_class),
-    path("teach/class/<int:class_id>", views.teach_class_dashboard),
-    path("teach/class/<int:class_id>/join-card", views.teach_class_join_card),
-    path("teach/class/<int:class_id>/rename-student", views.teach_rename_student),
-    path("teach/class/<int:class_id>/reset-roster", views.teach_reset_roster),
-    path("teach/class/<int:class_id>/toggle-lock", views.teach_toggle_lock),
-    path("teach/class/<int:class_id>/lock", views.teach_lock_class),
-    path("teach/class/<int:class_id>/export-submissions-today", views.teach_export_class_submissions_today),
-    path("teach/class/<int:class_id>/rotate-code", views.teach_rotate_code),
-    path("teach/class/<int:class_id>/add-module", views.teach_add_module),
-    path("teach/class/<int:class_id>/move-module", views.teach_move_module),
-    path("teach/videos", views.teach_videos),
-    path("teach/module/<int:module_id>", views.teach_module),
-    path("teach/module/<int:module_id>/add-material", views.teach_add_material),
-    path("teach/module/<int:module_id>/move-material", views.teach_move_material),
-    path("teach/material/<int:material_id>/submissions", views.teach_material_submissions),
+    path("teach/", include(_teach_patterns)),
+
+    # Admin surface (operations/configuration). Kept separate from daily teaching UI.
+    path("admin/", admin.site.urls),
+    path("internal/events/helper-chat-access", views.internal_helper_chat_access_event),
 ]
@@ -2,9 +2,29 @@ import os
 import sys
 from pathlib import Path
 from django.core.wsgi import get_wsgi_application
+from django.urls import Resolver404, get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 SERVICES_DIR = Path(__file__).resolve().parents[2]
 if str(SERVICES_DIR) not in sys.path:
     sys.path.insert(0, str(SERVICES_DIR))
 application = get_wsgi_application()
+
+# Subscribe this worker to cross-process student memo invalidations. Only the
+# served app boots through here (not tests or manage.py), and the call is a
+# no-op without REDIS_URL or when the listener is already running.
+from hub.services.context_invalidation import start_listener  # noqa: E402
+from hub.services.student_context import forget_student_context  # noqa: E402
+
+start_listener(forget_student_context)
+
+
+def _warm_urlconf() -> None:
+    """Import the URLconf and its view modules while the worker boots."""
+    try:
+        get_resolver().resolve("/healthz")
+    except Resolver404:
+        pass
+
+
+_warm_urlconf()
@@ -1,4 +1,11 @@
-from django.contrib import admin
+import hashlib
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.http import HttpResponse
 from django.utils.html import format_html
 
 from .models import (
@@ -15,6 +22,67 @@ from .models import (
     Submission,
 )
 
+
+class _DeferringChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        return qs.defer(*self.model_admin.changelist_deferred_fields)
+
+
+class DeferredChangelistMixin:
+    """Skip large columns that list pages never render.
+
+    Only the changelist is narrowed; change/detail views still load every field.
+    """
+
+    changelist_deferred_fields: tuple[str, ...] = ()
+
+    def get_changelist(self, request, **kwargs):
+        return _DeferringChangeList
+
+
+class AppendOnlyChangelistCacheMixin:
+    """Reuse a rendered changelist until the append-only table changes.
+
+    The cache key carries the table's (min id, max id) stamp: inserts move the
+    max and retention pruning moves the min, so no explicit invalidation is
+    needed. Keys are per user and per CSRF cookie so cached forms keep a valid
+    token, and pages with pending flash messages are never cached. Site and
+    model permissions are re-checked on every request, so revoking staff,
+    view permission or the OTP session takes effect before the TTL expires.
+    """
+
+    changelist_cache_seconds = 30
+
+    def _changelist_cache_key(self, request) -> str:
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+        if request.method != "GET" or not csrf_cookie or len(messages.get_messages(request)):
+            return ""
+        if not (self.admin_site.has_permission(request) and self.has_view_or_change_permission(request)):
+            # Let the real view raise PermissionDenied / redirect to login.
+            return ""
+        stamp = self.model._default_manager.aggregate(lo=Min("pk"), hi=Max("pk"))
+        digest = hashlib.sha256(
+            f"{request.user.pk}:{csrf_cookie}:{request.get_full_path()}".encode("utf-8")
+        ).hexdigest()[:32]
+        return f"admin_changelist:{self.model._meta.label_lower}:{stamp['lo']}:{stamp['hi']}:{digest}"
+
+    def changelist_view(self, request, extra_context=None):
+        key = "" if extra_context else self._changelist_cache_key(request)
+        if key:
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                return HttpResponse(content, headers=headers)
+
+        response = super().changelist_view(request, extra_context)
+        if key and response.status_code == 200:
+            if hasattr(response, "render"):
+                response.render()
+            cache.set(key, (response.content, dict(response.items())), self.changelist_cache_seconds)
+        return response
+
+
 @admin.register(Class)
 class ClassAdmin(admin.ModelAdmin):
     list_display = ("name", "join_code", "is_locked")
@@ -24,24 +92,33 @@ class ClassAdmin(admin.ModelAdmin):
 @admin.register(Module)
 class ModuleAdmin(admin.ModelAdmin):
     list_display = ("title", "classroom", "order_index")
+    list_select_related = ("classroom",)
     list_filter = ("classroom",)
 
 @admin.register(Material)
-class MaterialAdmin(admin.ModelAdmin):
+class MaterialAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("title", "module", "type", "order_index")
+    # Module.__str__ reads its classroom name.
+    list_select_related = ("module__classroom",)
+    changelist_deferred_fields = ("body",)
     list_filter = ("type", "module__classroom")
 
 @admin.register(StudentIdentity)
 class StudentIdentityAdmin(admin.ModelAdmin):
     list_display = ("display_name", "return_code", "classroom", "created_at", "last_seen_at")
+    list_select_related = ("classroom",)
     list_filter = ("classroom",)
     search_fields = ("display_name", "return_code")
 
 
 @admin.register(StudentEvent)
-class StudentEventAdmin(admin.ModelAdmin):
+class StudentEventAdmin(AppendOnlyChangelistCacheMixin, DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("created_at", "event_type", "classroom", "student", "source", "ip_address")
+    # StudentIdentity.__str__ reads its classroom join code.
+    list_select_related = ("classroom", "student__classroom")
+    changelist_deferred_fields = ("details",)
     list_filter = ("event_type", "classroom", "student", ("created_at", admin.DateFieldListFilter))
+    # Backed by pg_trgm indexes on PostgreSQL (migration 0012) so substring search avoids seq scans.
     search_fields = ("source", "ip_address", "student__display_name", "classroom__name", "classroom__join_code")
     readonly_fields = ("created_at",)
 
@@ -56,8 +133,10 @@ class StudentEventAdmin(admin.ModelAdmin):
 
 
 @admin.register(Submission)
-class SubmissionAdmin(admin.ModelAdmin):
+class SubmissionAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("id", "uploaded_at", "student", "material", "original_filename", "download_link")
+    list_select_related = ("student__classroom", "material")
+    changelist_deferred_fields = ("note", "material__body")
     list_filter = ("material__module__classroom", "material")
     search_fields = ("original_filename", "student__display_name")
     readonly_fields = ("uploaded_at",)
@@ -76,8 +155,10 @@ class LessonVideoAdmin(admin.ModelAdmin):
 
 
 @admin.register(LessonRelease)
-class LessonReleaseAdmin(admin.ModelAdmin):
+class LessonReleaseAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("classroom", "course_slug", "lesson_slug", "available_on", "force_locked", "updated_at")
+    list_select_related = ("classroom",)
+    changelist_deferred_fields = ("helper_topics_override", "helper_allowed_topics_override")
     list_filter = ("classroom", "course_slug", "force_locked")
     search_fields = ("classroom__name", "classroom__join_code", "course_slug", "lesson_slug")
 
@@ -90,7 +171,7 @@ class LessonAssetFolderAdmin(admin.ModelAdmin):
 
 
 @admin.register(LessonAsset)
-class LessonAssetAdmin(admin.ModelAdmin):
+class LessonAssetAdmin(DeferredChangelistMixin, admin.ModelAdmin):
     list_display = (
         "title",
         "folder",
@@ -101,6 +182,8 @@ class LessonAssetAdmin(admin.ModelAdmin):
         "download_link",
     )
     list_filter = ("is_active", "folder", "course_slug", "lesson_slug")
+    list_select_related = ("folder",)
+    changelist_deferred_fields = ("description",)
     search_fields = ("title", "description", "original_filename", "folder__path", "course_slug", "lesson_slug")
     readonly_fields = ("created_at", "updated_at")
     autocomplete_fields = ("folder",)
@@ -112,8 +195,10 @@ class LessonAssetAdmin(admin.ModelAdmin):
 
 
 @admin.register(AuditEvent)
-class AuditEventAdmin(admin.ModelAdmin):
+class AuditEventAdmin(AppendOnlyChangelistCacheMixin, DeferredChangelistMixin, admin.ModelAdmin):
     list_display = ("created_at", "action", "actor_user", "classroom", "target_type", "target_id", "ip_address")
+    list_select_related = ("actor_user", "classroom")
+    changelist_deferred_fields = ("metadata",)
     list_filter = ("action", "classroom", "actor_user")
     search_fields = ("action", "summary", "target_type", "target_id", "ip_address", "actor_user__username")
     readonly_fields = ("created_at",)
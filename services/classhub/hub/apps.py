@@ -6,5 +6,5 @@ class HubConfig(AppConfig):
     name = "hub"
 
     def ready(self):
-        # Register file-cleanup signal handlers.
+        # Register file-cleanup and student-memo signal handlers.
         from . import signals  # noqa: F401
@@ -1,6 +1,5 @@
 import base64
 import secrets
-import string
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
@@ -63,7 +62,7 @@ class Command(BaseCommand):
         if with_static_backup:
             backup_name = f"{device_name}-backup"
             backup_device, _ = StaticDevice.objects.get_or_create(user=user, name=backup_name)
-            backup_token = "".join(secrets.choice(string.digits) for _ in range(10))
+            backup_token = f"{secrets.randbelow(10**10):010d}"
             StaticToken.objects.create(device=backup_device, token=backup_token)
             self.stdout.write(self.style.WARNING("Generated one-time static backup token:"))
             self.stdout.write(backup_token)
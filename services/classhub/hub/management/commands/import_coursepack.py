@@ -18,6 +18,9 @@ Notes:
 
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 import yaml
@@ -29,14 +32,21 @@ from hub.models import Class, Module, Material
 
 
 def _courses_dir() -> Path:
-    return Path(getattr(settings, "CONTENT_ROOT", Path.cwd() / "content")) / "courses"
+    return Path(settings.CONTENT_COURSES_ROOT)
+
+
+# Lesson front matter is read + parsed in a small thread pool so file I/O overlaps.
+_FRONT_MATTER_WORKERS = 8
+
+# libyaml's C loader when PyYAML was built with it; same safe-load semantics.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def _load_manifest(course_slug: str) -> dict:
     manifest_path = _courses_dir() / course_slug / "course.yaml"
     if not manifest_path.exists():
         raise CommandError(f"Course manifest not found: {manifest_path}")
-    return yaml.safe_load(manifest_path.read_text(encoding="utf-8")) or {}
+    return yaml.load(manifest_path.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
 
 
 def _read_front_matter(course_slug: str, rel_path: str) -> dict:
@@ -49,23 +59,34 @@ def _read_front_matter(course_slug: str, rel_path: str) -> dict:
     parts = raw.split("---", 2)
     if len(parts) < 3:
         return {}
-    return yaml.safe_load(parts[1]) or {}
+    return yaml.load(parts[1], Loader=_YAML_LOADER) or {}
+
+
+def _course_pack_hash(course_slug: str, lessons: list) -> str:
+    """Digest the manifest and every lesson file the import would read."""
+    course_dir = _courses_dir() / course_slug
+    h = hashlib.blake2b(digest_size=16)
+    h.update(course_slug.encode("utf-8"))
+    h.update((course_dir / "course.yaml").read_bytes())
+    for l in lessons:
+        rel_path = (l.get("file") or "").strip()
+        if not rel_path:
+            continue
+        lesson_path = (course_dir / rel_path).resolve()
+        h.update(rel_path.encode("utf-8"))
+        if lesson_path.exists():
+            h.update(lesson_path.read_bytes())
+    return h.hexdigest()
 
 
 def _normalize_submission_extensions(submission: dict, naming: str) -> list[str]:
     accepted = submission.get("accepted") or []
     if isinstance(accepted, str):
-        accepted = [p.strip() for p in accepted.replace("|", ",").split(",") if p.strip()]
+        accepted = accepted.replace("|", ",").split(",")
 
-    exts = []
-    for raw in accepted:
-        ext = str(raw).strip().lower()
-        if not ext:
-            continue
-        if not ext.startswith("."):
-            ext = "." + ext
-        if ext not in exts:
-            exts.append(ext)
+    cleaned = (str(raw).strip().lower() for raw in accepted)
+    # dict.fromkeys dedups in O(n) while keeping first-seen order.
+    exts = list(dict.fromkeys(ext if ext.startswith(".") else "." + ext for ext in cleaned if ext))
 
     if not exts and naming:
         maybe_ext = Path(naming).suffix.strip().lower()
@@ -128,13 +149,23 @@ class Command(BaseCommand):
             if not classroom:
                 classroom = Class.objects.create(name=default_name)
 
+        content_hash = _course_pack_hash(course_slug, lessons)
+        if (
+            not opts.get("replace")
+            and classroom.content_hash == content_hash
+            and classroom.modules.exists()
+        ):
+            self.stdout.write(self.style.SUCCESS(
+                f"Course '{course_slug}' is up to date in class '{classroom.name}' ({classroom.join_code})."
+            ))
+            return
+
         if opts.get("replace"):
             classroom.modules.all().delete()
 
-        # Import
-        created_modules = 0
-        created_materials = 0
-
+        # Import: build every Module first, insert them in one batch, then
+        # insert all of their Materials in a second batch.
+        planned: list[tuple[Module, str, str]] = []
         for l in lessons:
             session = int(l.get("session") or 0)
             lesson_slug = (l.get("slug") or "").strip()
@@ -145,21 +176,29 @@ class Command(BaseCommand):
                 continue
 
             module_title = f"Session {session}: {title}" if session else title
-            mod = Module.objects.create(classroom=classroom, title=module_title, order_index=session)
-            created_modules += 1
+            planned.append((Module(classroom=classroom, title=module_title, order_index=session), lesson_slug, rel_path))
+
+        Module.objects.bulk_create([mod for mod, _, _ in planned])
 
+        with ThreadPoolExecutor(max_workers=_FRONT_MATTER_WORKERS) as pool:
+            front_matters = list(
+                pool.map(partial(_read_front_matter, course_slug), [rel_path for _, _, rel_path in planned])
+            )
+
+        materials: list[Material] = []
+        for (mod, lesson_slug, rel_path), fm in zip(planned, front_matters):
             # Main lesson link
-            Material.objects.create(
-                module=mod,
-                title="Open lesson",
-                type=Material.TYPE_LINK,
-                url=f"/course/{course_slug}/{lesson_slug}",
-                order_index=0,
+            materials.append(
+                Material(
+                    module=mod,
+                    title="Open lesson",
+                    type=Material.TYPE_LINK,
+                    url=f"/course/{course_slug}/{lesson_slug}",
+                    order_index=0,
+                )
             )
-            created_materials += 1
 
             # Quick-glance summary (text)
-            fm = _read_front_matter(course_slug, rel_path)
             makes = (fm.get("makes") or "").strip()
             submission = fm.get("submission") or {}
             naming = (submission.get("naming") or "").strip()
@@ -169,15 +208,16 @@ class Command(BaseCommand):
             # If the lesson expects a file submission, add a built-in dropbox.
             # This lets students submit privately from the lesson itself.
             if submission_type == "file":
-                Material.objects.create(
-                    module=mod,
-                    title="Homework dropbox",
-                    type=Material.TYPE_UPLOAD,
-                    accepted_extensions=",".join(exts or [".sb3"]),
-                    max_upload_mb=50,
-                    order_index=2,
+                materials.append(
+                    Material(
+                        module=mod,
+                        title="Homework dropbox",
+                        type=Material.TYPE_UPLOAD,
+                        accepted_extensions=",".join(exts or [".sb3"]),
+                        max_upload_mb=50,
+                        order_index=2,
+                    )
                 )
-                created_materials += 1
 
             summary_lines = []
             if makes:
@@ -188,14 +228,21 @@ class Command(BaseCommand):
                 summary_lines.append(f"Submit: {', '.join(exts)}")
 
             if summary_lines:
-                Material.objects.create(
-                    module=mod,
-                    title="Today at a glance",
-                    type=Material.TYPE_TEXT,
-                    body="\n".join(summary_lines),
-                    order_index=1,
+                materials.append(
+                    Material(
+                        module=mod,
+                        title="Today at a glance",
+                        type=Material.TYPE_TEXT,
+                        body="\n".join(summary_lines),
+                        order_index=1,
+                    )
                 )
-                created_materials += 1
+
+        Material.objects.bulk_create(materials, batch_size=500)
+        classroom.content_hash = content_hash
+        classroom.save(update_fields=["content_hash"])
+        created_modules = len(planned)
+        created_materials = len(materials)
 
         self.stdout.write(self.style.SUCCESS(
             f"Imported course '{course_slug}' into class '{classroom.name}' ({classroom.join_code}). "
@@ -13,6 +13,8 @@ from django.utils import timezone
 
 from hub.models import StudentEvent
 
+_DELETE_BATCH_SIZE = 5000
+
 
 class Command(BaseCommand):
     help = "Prune old StudentEvent rows (append-only telemetry retention)."
@@ -50,9 +52,12 @@ class Command(BaseCommand):
             .select_related("classroom", "student")
             .order_by("id")
         )
-        count = qs.count()
         self.stdout.write(f"Cutoff: {cutoff.isoformat()}")
-        self.stdout.write(f"Matched events: {count}")
+        # Counting is a full range scan on large telemetry tables; only the
+        # dry-run report needs it. Real runs report the rows actually deleted.
+        if dry_run:
+            count = qs.count()
+            self.stdout.write(f"Matched events: {count}")
 
         if export_csv:
             export_path = Path(export_csv)
@@ -102,5 +107,16 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING(f"[dry-run] Would delete events: {count}"))
             return
-        deleted, _details = qs.delete()
+        # Delete in id-ordered batches so a large retention backlog never runs
+        # as one long DELETE holding locks (and WAL) for the whole table scan.
+        deleted = 0
+        ids_qs = StudentEvent.objects.filter(created_at__lt=cutoff).order_by("id").values_list("id", flat=True)
+        start_id = 0
+        while True:
+            ids = list(ids_qs.filter(id__gt=start_id)[:_DELETE_BATCH_SIZE])
+            if not ids:
+                break
+            start_id = ids[-1]
+            batch_deleted, _details = StudentEvent.objects.filter(id__in=ids).delete()
+            deleted += batch_deleted
         self.stdout.write(self.style.SUCCESS(f"Deleted rows: {deleted}"))
@@ -3,13 +3,28 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from functools import partial
 
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
 from hub.models import Submission
 
+# File removal is I/O-bound (local unlink or object-store round-trip), so
+# overlap it across a small pool instead of deleting one file at a time.
+_FILE_DELETE_WORKERS = 16
+
+
+def _delete_stored_file(storage, name: str) -> bool:
+    """Return True when deleted, False on storage error."""
+    try:
+        storage.delete(name)
+    except Exception:
+        return False
+    return True
+
 
 class Command(BaseCommand):
     help = "Prune old student submissions and optionally remove files from disk."
@@ -43,46 +58,52 @@ class Command(BaseCommand):
 
         cutoff = timezone.now() - timedelta(days=days)
         qs = Submission.objects.filter(uploaded_at__lt=cutoff).order_by("id")
-        total = qs.count()
         self.stdout.write(f"Cutoff: {cutoff.isoformat()}")
-        self.stdout.write(f"Matched submissions: {total}")
 
-        if total == 0:
-            self.stdout.write(self.style.SUCCESS("Nothing to prune."))
+        if dry_run:
+            total = qs.count()
+            self.stdout.write(f"Matched submissions: {total}")
+            self.stdout.write(self.style.WARNING(f"[dry-run] Would delete rows: {total}"))
             return
 
         deleted_rows = 0
         deleted_files = 0
         file_errors = 0
 
-        start_id = 0
-        while True:
-            batch = list(
-                qs.filter(id__gt=start_id)
-                .only("id", "file")
-                .order_by("id")[:chunk_size]
-            )
-            if not batch:
-                break
-
-            for row in batch:
-                start_id = row.id
-                if dry_run:
-                    deleted_rows += 1
-                    continue
-
-                try:
-                    if row.file:
-                        row.file.delete(save=False)
-                        deleted_files += 1
-                except Exception:
+        storage = Submission._meta.get_field("file").storage
+        delete_file = partial(_delete_stored_file, storage)
+
+        def flush(rows: list[tuple[int, str]]) -> None:
+            nonlocal deleted_rows, deleted_files, file_errors
+            # Storage ops for the whole batch run in parallel, then one batched delete().
+            named = [(pk, name) for pk, name in rows if name]
+            removed = []
+            for (pk, _name), ok in zip(named, pool.map(delete_file, [name for _pk, name in named])):
+                if ok:
+                    deleted_files += 1
+                    removed.append(pk)
+                else:
                     file_errors += 1
-
-                row.delete()
-                deleted_rows += 1
-
-        if dry_run:
-            self.stdout.write(self.style.WARNING(f"[dry-run] Would delete rows: {deleted_rows}"))
+            # The post_delete handler would delete each file again, one at a
+            # time; blank the names already removed so it only retries failures.
+            if removed:
+                Submission.objects.filter(id__in=removed).update(file="")
+            batch_deleted, _details = Submission.objects.filter(id__in=[pk for pk, _name in rows]).delete()
+            deleted_rows += batch_deleted
+
+        batch: list[tuple[int, str]] = []
+        with ThreadPoolExecutor(max_workers=_FILE_DELETE_WORKERS) as pool:
+            # Plain (id, file name) tuples: no model instances or FieldFiles to build.
+            for row in qs.values_list("id", "file").iterator(chunk_size=chunk_size):
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+
+        if deleted_rows == 0:
+            self.stdout.write(self.style.SUCCESS("Nothing to prune."))
             return
 
         self.stdout.write(
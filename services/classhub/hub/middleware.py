@@ -8,20 +8,35 @@ This is the central trick that makes class-code auth feel like a real login.
 Later, this becomes the access-control boundary for the helper and for content.
 """
 
-from .models import StudentIdentity
+from .services.student_context import cached_student
 
+# str.startswith(tuple) checks every prefix in one C call; a compiled
+# alternation regex benchmarks slower for this short list.
 _SESSION_SKIP_PREFIXES = (
     "/static/",
     "/admin/",
     "/helper/",
+    "/apple-touch-icon",
 )
-_SESSION_SKIP_EXACT = {"/healthz"}
+# Browser housekeeping fetches never need learner context.
+_SESSION_SKIP_EXACT = frozenset({
+    "/healthz",
+    "/favicon.ico",
+    "/robots.txt",
+    "/manifest.webmanifest",
+    "/service-worker.js",
+})
+
+
+_STUDENT_SESSION_KEYS = ("student_id", "class_id", "class_epoch")
 
 
 def _clear_student_session(session) -> None:
-    session.pop("student_id", None)
-    session.pop("class_id", None)
-    session.pop("class_epoch", None)
+    # SessionBase.pop only flags the session as modified; the backend is
+    # written once by SessionMiddleware when the response goes out, so
+    # clearing several keys here costs a single save.
+    for key in _STUDENT_SESSION_KEYS:
+        session.pop(key, None)
 
 
 class StudentSessionMiddleware:
@@ -43,7 +58,7 @@ class StudentSessionMiddleware:
         request.student = None
         request.classroom = None
         path = (getattr(request, "path", "") or "").strip()
-        if path in _SESSION_SKIP_EXACT or any(path.startswith(prefix) for prefix in _SESSION_SKIP_PREFIXES):
+        if path in _SESSION_SKIP_EXACT or path.startswith(_SESSION_SKIP_PREFIXES):
             return self.get_response(request)
 
         # Student identity is stored in the session after `/join`.
@@ -52,34 +67,24 @@ class StudentSessionMiddleware:
         class_epoch = request.session.get("class_epoch")
 
         if sid and cid:
-            # Resolve both records in one query via select_related.
-            student = (
-                StudentIdentity.objects.select_related("classroom")
-                .filter(id=sid, classroom_id=cid)
-                .first()
-            )
+            # Join and the bootstrap below always store an int; anything else is
+            # a legacy/tampered value that must not match any class epoch.
+            if class_epoch is None or type(class_epoch) is int:
+                session_epoch = class_epoch
+            elif isinstance(class_epoch, str) and class_epoch.isdigit():
+                session_epoch = int(class_epoch)
+            else:
+                session_epoch = -1
+            # Resolve both records (and the epoch check) in one query via
+            # select_related, memoized briefly.
+            student = cached_student(sid, cid, session_epoch)
             classroom = getattr(student, "classroom", None) if student is not None else None
             if student is None or classroom is None:
                 _clear_student_session(request.session)
-                request.student = None
-                request.classroom = None
             else:
-                current_epoch = int(getattr(classroom, "session_epoch", 1) or 1)
-                if class_epoch is None:
-                    request.session["class_epoch"] = current_epoch
-                    request.student = student
-                    request.classroom = classroom
-                else:
-                    try:
-                        session_epoch = int(class_epoch)
-                    except Exception:
-                        session_epoch = -1
-                    if session_epoch != current_epoch:
-                        _clear_student_session(request.session)
-                        request.student = None
-                        request.classroom = None
-                    else:
-                        request.student = student
-                        request.classroom = classroom
+                if session_epoch is None:
+                    request.session["class_epoch"] = classroom.session_epoch
+                request.student = student
+                request.classroom = classroom
 
         return self.get_response(request)
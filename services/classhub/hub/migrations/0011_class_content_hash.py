@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0010_lessonrelease_helper_tuning"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="class",
+            name="content_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,46 @@
+"""Trigram indexes for the StudentEvent admin search columns (PostgreSQL only).
+
+Django's admin search compiles each search field to
+``UPPER(<col>::text) LIKE UPPER('%term%')`` (``HOST(<col>)`` for IP fields) on
+PostgreSQL. A pg_trgm GIN index on that exact expression lets the planner
+answer the substring match from the index instead of a sequential scan.
+Other database backends keep the plain column scan.
+"""
+
+from django.db import migrations
+
+_INDEXES = (
+    ("hub_studentevent_source_trgm", "hub_studentevent", 'UPPER("source"::text)'),
+    ("hub_studentevent_ip_trgm", "hub_studentevent", 'UPPER(HOST("ip_address"))'),
+    ("hub_studentidentity_name_trgm", "hub_studentidentity", 'UPPER("display_name"::text)'),
+    ("hub_class_name_trgm", "hub_class", 'UPPER("name"::text)'),
+    ("hub_class_join_code_trgm", "hub_class", 'UPPER("join_code"::text)'),
+)
+
+
+def _create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, expression in _INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin ({expression} gin_trgm_ops)'
+        )
+
+
+def _drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _expression in _INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0011_class_content_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(_create_trigram_indexes, _drop_trigram_indexes),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0012_admin_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="studentidentity",
+            name="hub_studeni_classro_3c11ef_idx",
+        ),
+    ]
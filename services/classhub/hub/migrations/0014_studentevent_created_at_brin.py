@@ -0,0 +1,36 @@
+"""BRIN index on StudentEvent.created_at (PostgreSQL only).
+
+StudentEvent is append-only, so created_at follows physical row order and a
+BRIN index answers the retention range scan (``created_at < cutoff``) from a
+few pages instead of a full B-tree. The composite B-tree indexes stay: they
+serve the filtered, ordered admin and teacher views. Other backends skip this.
+"""
+
+from django.db import migrations
+
+_INDEX_NAME = "hub_studentevent_created_brin"
+
+
+def _create_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS "{_INDEX_NAME}" ON "hub_studentevent" USING brin ("created_at")'
+    )
+
+
+def _drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS "{_INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0013_remove_redundant_return_code_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(_create_brin_index, _drop_brin_index),
+    ]
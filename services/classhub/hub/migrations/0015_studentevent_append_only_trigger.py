@@ -0,0 +1,57 @@
+"""Enforce StudentEvent append-only semantics in PostgreSQL.
+
+A BEFORE UPDATE trigger rejects any change to an event's recorded content.
+Only the classroom/student foreign keys may change, because SET_NULL cascades
+clear them when a class or student is deleted. DELETE stays allowed for
+``prune_student_events`` retention. Other backends rely on the model guard.
+"""
+
+from django.db import migrations
+
+_FUNCTION_NAME = "hub_studentevent_reject_update"
+_TRIGGER_NAME = "hub_studentevent_append_only"
+
+
+def _create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {_FUNCTION_NAME}() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.id IS DISTINCT FROM OLD.id
+               OR NEW.event_type IS DISTINCT FROM OLD.event_type
+               OR NEW.source IS DISTINCT FROM OLD.source
+               OR NEW.details IS DISTINCT FROM OLD.details
+               OR NEW.ip_address IS DISTINCT FROM OLD.ip_address
+               OR NEW.created_at IS DISTINCT FROM OLD.created_at THEN
+                RAISE EXCEPTION 'hub_studentevent is append-only';
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    schema_editor.execute(f'DROP TRIGGER IF EXISTS "{_TRIGGER_NAME}" ON "hub_studentevent"')
+    schema_editor.execute(
+        f'CREATE TRIGGER "{_TRIGGER_NAME}" BEFORE UPDATE ON "hub_studentevent" '
+        f"FOR EACH ROW EXECUTE FUNCTION {_FUNCTION_NAME}()"
+    )
+
+
+def _drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f'DROP TRIGGER IF EXISTS "{_TRIGGER_NAME}" ON "hub_studentevent"')
+    schema_editor.execute(f"DROP FUNCTION IF EXISTS {_FUNCTION_NAME}()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0014_studentevent_created_at_brin"),
+    ]
+
+    operations = [
+        migrations.RunPython(_create_trigger, _drop_trigger),
+    ]
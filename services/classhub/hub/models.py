@@ -15,13 +15,21 @@ from django.conf import settings
 from django.db import models
 
 
+# Exactly 32 symbols (no 0/O, 1/I), so the low 5 bits of a random byte pick one
+# without bias and codes need a single CSPRNG read.
+_CODE_ALPHABET = b"ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+
+def _random_code(length: int) -> str:
+    return bytes(_CODE_ALPHABET[b & 0x1F] for b in secrets.token_bytes(length)).decode("ascii")
+
+
 def gen_class_code(length: int = 8) -> str:
     """Generate a human-friendly class code.
 
     Excludes ambiguous characters (0/O, 1/I).
     """
-    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    return _random_code(length)
 
 
 def gen_student_return_code(length: int = 6) -> str:
@@ -29,8 +37,7 @@ def gen_student_return_code(length: int = 6) -> str:
 
     This is shown to students so they can reclaim their identity after cookie loss.
     """
-    alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    return _random_code(length)
 
 
 class Class(models.Model):
@@ -46,6 +53,8 @@ class Class(models.Model):
     is_locked = models.BooleanField(default=False)
     # Increment to invalidate active student sessions without rotating database IDs.
     session_epoch = models.PositiveIntegerField(default=1)
+    # Digest of the last course pack imported into this class (see import_coursepack).
+    content_hash = models.CharField(max_length=64, blank=True, default="")
 
     def __str__(self) -> str:
         return f"{self.name} ({self.join_code})"
@@ -107,13 +116,20 @@ class Material(models.Model):
         return self.title
 
 
+_SUBMISSION_EXT_RE = re.compile(r"\.[a-z0-9]{1,16}")
+_SAFE_PATH_PART_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+_SAFE_ASSET_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
 def _submission_upload_to(instance: "Submission", filename: str) -> str:
     """Upload path for student submissions.
 
     We keep paths boring and segregated by class + material.
+    Runs inside the upload POST, so it must not trigger DB IO: callers pass a
+    Material loaded with select_related("module").
     """
     ext = Path(str(filename or "")).suffix.lower()
-    if not re.fullmatch(r"\.[a-z0-9]{1,16}", ext or ""):
+    if not _SUBMISSION_EXT_RE.fullmatch(ext or ""):
         ext = ""
     stored_name = f"{secrets.token_hex(16)}{ext}"
 
@@ -157,17 +173,17 @@ class StudentIdentity(models.Model):
     last_seen_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        # Return code only needs to be unique inside one class.
+        # Return code only needs to be unique inside one class. The unique
+        # index behind this constraint also serves class + return code lookups.
         constraints = [
             models.UniqueConstraint(
                 fields=["classroom", "return_code"],
                 name="uniq_student_return_code_per_class",
             ),
         ]
-        # Speeds up joins/searches by class + display name/return code.
+        # Speeds up joins/searches by class + display name.
         indexes = [
             models.Index(fields=["classroom", "display_name"], name="hub_studeni_classro_11dfba_idx"),
-            models.Index(fields=["classroom", "return_code"], name="hub_studeni_classro_3c11ef_idx"),
         ]
 
     def __str__(self) -> str:
@@ -224,6 +240,8 @@ class StudentEvent(models.Model):
             models.Index(fields=["student", "created_at"], name="hub_student_student_01e0d2_idx"),
         ]
 
+    # PostgreSQL also rejects content updates with a trigger (migration 0015),
+    # which covers queryset .update() and raw SQL that bypass this guard.
     def save(self, *args, **kwargs):
         if self.pk is not None:
             raise ValueError("StudentEvent is append-only and cannot be updated.")
@@ -237,7 +255,7 @@ class StudentEvent(models.Model):
 
 
 def _safe_path_part(raw: str) -> str:
-    value = re.sub(r"[^a-zA-Z0-9_-]+", "-", (raw or "").strip().lower())
+    value = _SAFE_PATH_PART_RE.sub("-", (raw or "").strip().lower())
     value = value.strip("-")
     return value or "unknown"
 
@@ -249,17 +267,18 @@ def _lesson_video_upload_to(instance: "LessonVideo", filename: str) -> str:
 
 
 def _normalize_asset_folder_path(raw: str) -> str:
-    parts = []
-    for segment in str(raw or "").replace("\\", "/").split("/"):
-        segment = segment.strip()
-        if not segment:
-            continue
-        parts.append(_safe_path_part(segment))
-    return "/".join(parts) or "general"
+    # Slugs each segment ("My Folder" -> "my-folder") rather than tokenizing
+    # the whole path, which would split such names into separate folders and
+    # move existing assets. Lowercase once up front instead of per segment.
+    return "/".join(
+        _SAFE_PATH_PART_RE.sub("-", segment.strip()).strip("-") or "unknown"
+        for segment in str(raw or "").replace("\\", "/").lower().split("/")
+        if segment.strip()
+    ) or "general"
 
 
 def _safe_asset_filename(raw: str) -> str:
-    value = re.sub(r"[^A-Za-z0-9._-]+", "_", (raw or "").strip())
+    value = _SAFE_ASSET_FILENAME_RE.sub("_", (raw or "").strip())
     value = value.strip("._")
     return value or "asset"
 
@@ -6,7 +6,6 @@ import re
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from xml.sax.saxutils import escape
 
 
 CONTENT_TYPES_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
@@ -128,16 +127,21 @@ def public_overview_markdown(slug: str, title: str, sessions: int, duration: int
     return "\n".join(lines).rstrip() + "\n"
 
 
+# Same &, <, > escaping as xml.sax.saxutils.escape, done in one translate call.
+_XML_TEXT_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_DOCX_PARAGRAPH = "<w:p><w:r><w:t>{}</w:t></w:r></w:p>"
+_DOCX_PARAGRAPH_PRESERVE = '<w:p><w:r><w:t xml:space="preserve">{}</w:t></w:r></w:p>'
+
+
+def _docx_paragraph(raw_line: str) -> str:
+    if not raw_line:
+        return "<w:p/>"
+    template = _DOCX_PARAGRAPH_PRESERVE if raw_line != raw_line.strip() else _DOCX_PARAGRAPH
+    return template.format(raw_line.translate(_XML_TEXT_ESCAPE))
+
+
 def _docx_document_xml(text: str) -> str:
-    paragraphs = []
-    for raw_line in text.splitlines():
-        if not raw_line:
-            paragraphs.append("<w:p/>")
-            continue
-        attrs = ' xml:space="preserve"' if raw_line != raw_line.strip() else ""
-        paragraphs.append(f"<w:p><w:r><w:t{attrs}>{escape(raw_line)}</w:t></w:r></w:p>")
-
-    paragraph_xml = "".join(paragraphs)
+    paragraph_xml = "".join(map(_docx_paragraph, text.splitlines()))
     return f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
   <w:body>
@@ -151,11 +155,30 @@ def _docx_document_xml(text: str) -> str:
 """
 
 
+# The boilerplate parts are a few hundred bytes each, so they are encoded once
+# and stored uncompressed; only word/document.xml is worth deflating, and
+# level 1 is several times faster than zlib's default 6 for a few percent
+# larger output on short template text.
+_DOCX_DEFLATE_LEVEL = 1
+_DOCX_STATIC_PARTS = (
+    ("[Content_Types].xml", CONTENT_TYPES_XML.encode("utf-8")),
+    ("_rels/.rels", PACKAGE_RELS_XML.encode("utf-8")),
+    ("word/_rels/document.xml.rels", DOCUMENT_RELS_XML.encode("utf-8")),
+)
+
+
+def _stored_zip_info(name: str) -> zipfile.ZipInfo:
+    # Fresh per write: ZipFile.writestr records offsets/CRC on the ZipInfo.
+    info = zipfile.ZipInfo(name)
+    info.compress_type = zipfile.ZIP_STORED
+    info.external_attr = 0o600 << 16
+    return info
+
+
 def _write_docx(path: Path, text: str) -> None:
-    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
-        zf.writestr("_rels/.rels", PACKAGE_RELS_XML)
-        zf.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS_XML)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=_DOCX_DEFLATE_LEVEL) as zf:
+        for name, data in _DOCX_STATIC_PARTS:
+            zf.writestr(_stored_zip_info(name), data)
         zf.writestr("word/document.xml", _docx_document_xml(text))
 
 
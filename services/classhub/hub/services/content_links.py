@@ -21,7 +21,10 @@ _YOUTUBE_HOSTS = {
 _COURSE_LESSON_PATH_RE = re.compile(
     r"^/course/(?P<course_slug>[-a-zA-Z0-9_]+)/(?P<lesson_slug>[-a-zA-Z0-9_]+)$"
 )
-_VIDEO_EXTENSIONS = {
+_YOUTUBE_ID_RE = re.compile(r"[A-Za-z0-9_-]{6,20}")
+# Paths whose second segment is the video id (watch/youtu.be are handled apart).
+_YOUTUBE_ID_PATH_PREFIXES = ("/embed/", "/shorts/", "/live/")
+_VIDEO_EXTENSIONS = (
     ".m3u8",
     ".mp4",
     ".m4v",
@@ -29,20 +32,21 @@ _VIDEO_EXTENSIONS = {
     ".webm",
     ".ogg",
     ".ogv",
-}
+)
 
 
 def courses_dir() -> Path:
-    return Path(settings.CONTENT_ROOT) / "courses"
+    return Path(settings.CONTENT_COURSES_ROOT)
 
 
 def extract_youtube_id(url: str) -> str:
     if not url:
         return ""
-    parsed = urlparse(url.strip())
-    host = parsed.netloc.lower()
-    if ":" in host:
-        host = host.split(":", 1)[0]
+    return _youtube_id_from_parsed(urlparse(url.strip()))
+
+
+def _youtube_id_from_parsed(parsed) -> str:
+    host = parsed.netloc.lower().partition(":")[0]
     if host not in _YOUTUBE_HOSTS:
         return ""
 
@@ -51,25 +55,24 @@ def extract_youtube_id(url: str) -> str:
         video_id = parsed.path.lstrip("/").split("/", 1)[0]
     elif parsed.path == "/watch":
         video_id = parse_qs(parsed.query).get("v", [""])[0]
-    elif (
-        parsed.path.startswith("/embed/")
-        or parsed.path.startswith("/shorts/")
-        or parsed.path.startswith("/live/")
-    ):
+    elif parsed.path.startswith(_YOUTUBE_ID_PATH_PREFIXES):
         parts = [p for p in parsed.path.split("/") if p]
         if len(parts) >= 2:
             video_id = parts[1]
 
-    if re.fullmatch(r"[A-Za-z0-9_-]{6,20}", video_id or ""):
+    if _YOUTUBE_ID_RE.fullmatch(video_id or ""):
         return video_id
     return ""
 
 
+def _is_http_url(parsed) -> bool:
+    return parsed.scheme.lower() in {"http", "https"}
+
+
 def safe_external_url(url: str) -> str:
     if not url:
         return ""
-    parsed = urlparse(url.strip())
-    if parsed.scheme.lower() not in {"http", "https"}:
+    if not _is_http_url(urlparse(url.strip())):
         return ""
     return url.strip()
 
@@ -97,9 +100,11 @@ def build_asset_url(url_or_path: str) -> str:
 def is_probably_video_url(url: str) -> bool:
     if not url:
         return False
-    parsed = urlparse(url)
-    path = (parsed.path or "").lower()
-    return any(path.endswith(ext) for ext in _VIDEO_EXTENSIONS)
+    return _has_video_extension(urlparse(url))
+
+
+def _has_video_extension(parsed) -> bool:
+    return (parsed.path or "").lower().endswith(_VIDEO_EXTENSIONS)
 
 
 def video_mime_type(url: str) -> str:
@@ -136,16 +141,26 @@ def normalize_lesson_videos(front_matter: dict) -> list[dict]:
         title = str(video.get("title") or vid or f"Video {i}").strip()
         minutes = video.get("minutes")
         outcome = str(video.get("outcome") or "").strip()
-        url = safe_external_url(str(video.get("url") or "").strip())
+        # Parse the authored URL once; the scheme, YouTube and extension
+        # checks below all read the same ParseResult.
+        url = str(video.get("url") or "").strip()
+        parsed = urlparse(url) if url else None
+        if parsed is not None and not _is_http_url(parsed):
+            url, parsed = "", None
         youtube_id = str(video.get("youtube_id") or "").strip()
-        if youtube_id and not re.fullmatch(r"[A-Za-z0-9_-]{6,20}", youtube_id):
+        if youtube_id and not _YOUTUBE_ID_RE.fullmatch(youtube_id):
             youtube_id = ""
-        if not youtube_id and url:
-            youtube_id = extract_youtube_id(url)
+        if not youtube_id and parsed is not None:
+            youtube_id = _youtube_id_from_parsed(parsed)
         if youtube_id and not url:
             url = f"https://www.youtube.com/watch?v={youtube_id}"
         embed_url = f"https://www.youtube.com/embed/{youtube_id}" if youtube_id else ""
-        source_type = "youtube" if youtube_id else ("native" if is_probably_video_url(url) else "link")
+        if youtube_id:
+            source_type = "youtube"
+        elif parsed is not None and _has_video_extension(parsed):
+            source_type = "native"
+        else:
+            source_type = "link"
         media_url = url if source_type == "native" else ""
         media_type = video_mime_type(url) if media_url else ""
         normalized.append(
@@ -0,0 +1,102 @@
+"""Cross-process invalidation for the student session memo.
+
+StudentSessionMiddleware memoizes student/classroom lookups per worker
+process. The model signals in ``hub.signals`` drop entries in the writing
+process and publish the change here; each web worker subscribes at WSGI boot
+(``config.wsgi``) so roster resets and epoch bumps take effect immediately
+instead of after the memo TTL. Without ``REDIS_URL`` everything here is a
+no-op and the TTL alone bounds staleness.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import Callable
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "classhub:student-context"
+
+_publisher = None
+_publisher_lock = threading.Lock()
+_listener: threading.Thread | None = None
+_listener_lock = threading.Lock()
+
+
+def _redis_url() -> str:
+    return str(getattr(settings, "REDIS_URL", "") or "").strip()
+
+
+def _client():
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            import redis
+
+            _publisher = redis.Redis.from_url(_redis_url(), socket_timeout=1, socket_connect_timeout=1)
+        return _publisher
+
+
+def publish_student_context_change(*, student_id: int | None = None, class_id: int | None = None) -> None:
+    """Tell other workers to forget memoized lookups for a student and/or class."""
+    if not _redis_url():
+        return
+    message = json.dumps({"student_id": student_id, "class_id": class_id})
+    try:
+        _client().publish(CHANNEL, message)
+    except Exception as exc:
+        # Best effort: the memo TTL still bounds staleness.
+        logger.warning("student_context_publish_failed: %s", exc.__class__.__name__)
+
+
+def _parse_id(value) -> int | None:
+    return value if type(value) is int else None
+
+
+def handle_message(data, forget: Callable[..., None]) -> None:
+    try:
+        payload = json.loads(data)
+    except (TypeError, ValueError):
+        return
+    if not isinstance(payload, dict):
+        return
+    forget(student_id=_parse_id(payload.get("student_id")), class_id=_parse_id(payload.get("class_id")))
+
+
+def start_listener(forget: Callable[..., None]) -> None:
+    """Start this process's subscriber thread once (no-op without Redis)."""
+    global _listener
+    if not _redis_url():
+        return
+    with _listener_lock:
+        if _listener is not None and _listener.is_alive():
+            return
+        _listener = threading.Thread(
+            target=_listen_forever,
+            args=(forget,),
+            name="classhub-student-context",
+            daemon=True,
+        )
+        _listener.start()
+
+
+def _listen_forever(forget: Callable[..., None]) -> None:
+    import redis
+
+    backoff = 1.0
+    while True:
+        try:
+            pubsub = redis.Redis.from_url(_redis_url()).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            backoff = 1.0
+            for message in pubsub.listen():
+                handle_message(message.get("data"), forget)
+        except Exception as exc:
+            logger.warning("student_context_listener_error: %s", exc.__class__.__name__)
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
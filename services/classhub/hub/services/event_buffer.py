@@ -0,0 +1,105 @@
+"""Per-process buffer that writes append-only event rows in batches.
+
+Each buffer is tied to one model and two settings: a flush interval in
+seconds (0 disables buffering; callers then write through) and a batch size.
+Queued rows are written by a lazily started daemon thread with one
+``bulk_create`` per flush, and once more at interpreter exit. Rows queued in a
+worker that is killed before its next flush are lost, and ``auto_now_add``
+timestamps record flush time rather than request time.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    def __init__(self, model, *, flush_setting: str, batch_setting: str, default_batch_size: int = 64):
+        self.model = model
+        self.flush_setting = flush_setting
+        self.batch_setting = batch_setting
+        self.default_batch_size = default_batch_size
+        self._rows: list = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: threading.Thread | None = None
+        atexit.register(self.flush)
+
+    @property
+    def label(self) -> str:
+        return self.model._meta.model_name
+
+    def flush_seconds(self) -> float:
+        return float(getattr(settings, self.flush_setting, 0) or 0)
+
+    def batch_size(self) -> int:
+        value = getattr(settings, self.batch_setting, self.default_batch_size) or self.default_batch_size
+        return max(int(value), 1)
+
+    def enabled(self) -> bool:
+        return self.flush_seconds() > 0
+
+    def add(self, row) -> None:
+        """Queue one unsaved row; wakes the flusher early once a batch is full."""
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.batch_size()
+            self._ensure_flusher()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write every queued row; returns how many rows were inserted."""
+        with self._lock:
+            batch = self._rows[:]
+            self._rows.clear()
+        if not batch:
+            return 0
+
+        try:
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size())
+            return len(batch)
+        except Exception:
+            logger.warning("%s_batch_write_failed size=%s; retrying row by row", self.label, len(batch))
+
+        # A single bad row (e.g. a foreign key deleted since it was queued)
+        # should not drop the rest of the batch.
+        written = 0
+        for row in batch:
+            row.pk = None
+            try:
+                row.save()
+                written += 1
+            except Exception:
+                logger.exception("%s_write_failed", self.label)
+        return written
+
+    def _ensure_flusher(self) -> None:
+        # Called with self._lock held.
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            name=f"classhub-{self.label}-buffer",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds() or 1.0)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s_flush_failed", self.label)
+            finally:
+                # Honour CONN_MAX_AGE for this thread's own connection.
+                close_old_connections()
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import re
 
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
 
 def safe_filename(value: str) -> str:
     """Return a conservative filesystem/header-safe filename."""
     name = (value or "file").strip()
-    name = re.sub(r"[^A-Za-z0-9._-]+", "_", name)
+    name = _UNSAFE_FILENAME_RE.sub("_", name)
     name = name.strip("._")
     return name or "file"
 
@@ -1,19 +1,24 @@
 """Markdown/course parsing and sanitization helpers for Class Hub views."""
 
-import copy
 from functools import lru_cache
 from pathlib import Path
 import re
+import time
 from urllib.parse import urlparse
 
 import bleach
 import markdown as md
 import yaml
+
+try:
+    import nh3
+except ImportError:
+    nh3 = None
 from django.conf import settings
 
-from .content_links import build_asset_url
+from .content_links import asset_base_url, build_asset_url
 
-_COURSES_DIR = Path(settings.CONTENT_ROOT) / "courses"
+_COURSES_DIR = Path(settings.CONTENT_COURSES_ROOT)
 _HEADING_LEVEL2_RE = re.compile(r"^##\s+(.+?)\s*$")
 _IMG_TAG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
 _IMG_SRC_RE = re.compile(r"""\bsrc\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.IGNORECASE)
@@ -33,6 +38,32 @@ _TEACHER_SECTION_PREFIXES = (
     "extensions (fast finisher menu)",
     "notes + options",
 )
+_TEACHER_HEADING_PREFIXES = ("teacher ",) + _TEACHER_SECTION_PREFIXES
+
+
+# path -> (checked_at, mtime_ns or None when missing). Bounded because course
+# slugs come straight from request URLs.
+_CONTENT_STAT_MAX_KEYS = 2048
+_content_stat: dict[str, tuple[float, int | None]] = {}
+
+
+def _content_mtime_ns(path: Path) -> int | None:
+    """Return the file's mtime_ns (None if missing), re-stat'ing at most once per TTL."""
+    key = str(path)
+    now = time.monotonic()
+    ttl = float(getattr(settings, "CLASSHUB_CONTENT_STAT_TTL_SECONDS", 0) or 0)
+    entry = _content_stat.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if ttl > 0:
+        if len(_content_stat) >= _CONTENT_STAT_MAX_KEYS:
+            _content_stat.clear()
+        _content_stat[key] = (now, mtime_ns)
+    return mtime_ns
 
 
 @lru_cache(maxsize=256)
@@ -59,6 +90,22 @@ def _load_lesson_cached(path_str: str, mtime_ns: int) -> tuple[dict, str]:
     return {}, raw
 
 
+def _clone_plain(value):
+    """Copy yaml.safe_load output for a caller.
+
+    safe_load only builds dicts, lists and sets around immutable scalars
+    (str, int, float, bool, None, dates, bytes), so this skips deepcopy's
+    memo bookkeeping on every cache hit.
+    """
+    if isinstance(value, dict):
+        return {key: _clone_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone_plain(item) for item in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
 def validate_front_matter(front_matter_text: str, source: Path) -> None:
     for lineno, line in enumerate(front_matter_text.splitlines(), start=1):
         stripped = line.lstrip()
@@ -80,10 +127,10 @@ def validate_front_matter(front_matter_text: str, source: Path) -> None:
 
 def load_course_manifest(course_slug: str) -> dict:
     manifest_path = _COURSES_DIR / course_slug / "course.yaml"
-    if not manifest_path.exists():
+    mtime_ns = _content_mtime_ns(manifest_path)
+    if mtime_ns is None:
         return {}
-    mtime_ns = manifest_path.stat().st_mtime_ns
-    return copy.deepcopy(_load_manifest_cached(str(manifest_path), mtime_ns))
+    return _clone_plain(_load_manifest_cached(str(manifest_path), mtime_ns))
 
 
 def load_lesson_markdown(course_slug: str, lesson_slug: str) -> tuple[dict, str, dict]:
@@ -98,21 +145,19 @@ def load_lesson_markdown(course_slug: str, lesson_slug: str) -> tuple[dict, str,
     if not rel:
         return {}, "", match
     lesson_path = (_COURSES_DIR / course_slug / rel).resolve()
-    if not lesson_path.exists():
+    mtime_ns = _content_mtime_ns(lesson_path)
+    if mtime_ns is None:
         return {}, "", match
 
-    mtime_ns = lesson_path.stat().st_mtime_ns
     fm, body = _load_lesson_cached(str(lesson_path), mtime_ns)
-    return copy.deepcopy(fm), body, match
+    return _clone_plain(fm), body, match
 
 
 def is_teacher_section_heading(heading_text: str) -> bool:
-    normalized = re.sub(r"\s+", " ", (heading_text or "").strip().lower())
-    if not normalized:
-        return False
-    if normalized.startswith("teacher "):
-        return True
-    return any(normalized.startswith(prefix) for prefix in _TEACHER_SECTION_PREFIXES)
+    # split()/join collapses whitespace like re.sub(r"\s+") without the regex,
+    # and one tuple startswith (C-level) beats a compiled alternation here.
+    normalized = " ".join((heading_text or "").lower().split())
+    return normalized.startswith(_TEACHER_HEADING_PREFIXES)
 
 
 def split_lesson_markdown_for_audiences(markdown_text: str) -> tuple[str, str]:
@@ -141,7 +186,8 @@ def split_lesson_markdown_for_audiences(markdown_text: str) -> tuple[str, str]:
             learner_chunks.append(text)
 
     for line in stripped_markdown.splitlines():
-        heading = _HEADING_LEVEL2_RE.match(line)
+        # Cheap prefix test first: most lines are body text, not "## " headings.
+        heading = _HEADING_LEVEL2_RE.match(line) if line.startswith("##") else None
         if heading:
             flush_chunk()
             chunk_lines.append(line)
@@ -196,13 +242,113 @@ def teacher_panel_markdown(front_matter: dict) -> str:
     return "\n".join(lines).strip() + "\n"
 
 
+# Sanitizer policy: bleach's defaults plus the block/table markup that
+# markdown emits. Spelled out so both sanitizer backends share it.
+_ALLOWED_TAGS = frozenset(
+    {
+        "a",
+        "abbr",
+        "acronym",
+        "b",
+        "blockquote",
+        "code",
+        "em",
+        "i",
+        "li",
+        "ol",
+        "strong",
+        "ul",
+        "p",
+        "pre",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "hr",
+        "br",
+        "table",
+        "thead",
+        "tbody",
+        "tr",
+        "th",
+        "td",
+        "details",
+        "summary",
+    }
+)
+_ALLOWED_ATTRIBUTES = {
+    "a": frozenset({"href", "title", "target", "rel"}),
+    "abbr": frozenset({"title"}),
+    "acronym": frozenset({"title"}),
+    "code": frozenset({"class"}),
+    "pre": frozenset({"class"}),
+    "h1": frozenset({"id"}),
+    "h2": frozenset({"id"}),
+    "h3": frozenset({"id"}),
+    "h4": frozenset({"id"}),
+}
+_IMG_ATTRIBUTES = frozenset({"src", "alt", "title", "loading", "decoding"})
+_URL_SCHEMES = frozenset({"http", "https", "mailto"})
+
+
+def _sanitize_html(html: str, *, allow_images: bool, img_src_allowed) -> str:
+    """Strip everything outside the policy above.
+
+    Uses nh3 (Rust ammonia) when installed; bleach (pure-Python html5lib) is
+    the fallback for platforms without an nh3 wheel.
+    """
+    tags = _ALLOWED_TAGS | {"img"} if allow_images else _ALLOWED_TAGS
+    if nh3 is not None:
+        attributes = dict(_ALLOWED_ATTRIBUTES)
+        if allow_images:
+            attributes["img"] = _IMG_ATTRIBUTES
+
+        def _attribute_filter(tag: str, name: str, value: str) -> str | None:
+            if tag == "img" and name == "src" and not img_src_allowed(value):
+                return None
+            return value
+
+        return nh3.clean(
+            html,
+            tags=set(tags),
+            clean_content_tags=set(),
+            attributes={tag: set(names) for tag, names in attributes.items()},
+            attribute_filter=_attribute_filter if allow_images else None,
+            url_schemes=set(_URL_SCHEMES),
+            link_rel=None,
+        )
+
+    def _img_attr_allowed(_tag: str, name: str, value: str) -> bool:
+        if name == "src":
+            return img_src_allowed(value)
+        return name in _IMG_ATTRIBUTES
+
+    attributes = {tag: list(names) for tag, names in _ALLOWED_ATTRIBUTES.items()}
+    if allow_images:
+        attributes["img"] = _img_attr_allowed
+    return bleach.clean(html, tags=tags, attributes=attributes, protocols=_URL_SCHEMES, strip=True)
+
+
 def render_markdown_to_safe_html(markdown_text: str) -> str:
     allow_images = bool(getattr(settings, "CLASSHUB_MARKDOWN_ALLOW_IMAGES", False))
-    allowed_hosts = {
+    allowed_hosts = frozenset(
         str(host).strip().lower()
         for host in getattr(settings, "CLASSHUB_MARKDOWN_ALLOWED_IMAGE_HOSTS", [])
         if str(host).strip()
-    }
+    )
+    # Lesson bodies only change with their files, so identical renders are
+    # served from memory. Every setting the output depends on is in the key.
+    return _render_markdown_cached(markdown_text or "", allow_images, allowed_hosts, asset_base_url())
+
+
+@lru_cache(maxsize=256)
+def _render_markdown_cached(
+    markdown_text: str,
+    allow_images: bool,
+    allowed_hosts: frozenset[str],
+    asset_base: str,
+) -> str:
+    # asset_base is only a cache key; build_asset_url() reads the same setting.
 
     def _img_src_allowed(value: str) -> bool:
         candidate = (value or "").strip()
@@ -217,57 +363,14 @@ def render_markdown_to_safe_html(markdown_text: str) -> str:
         # Relative path (same-origin once rendered).
         return True
 
-    def _img_attr_allowed(_tag: str, name: str, value: str) -> bool:
-        if name == "src":
-            return _img_src_allowed(value)
-        if name in {"alt", "title", "loading", "decoding"}:
-            return True
-        return False
-
+    # Python-Markdown, not a CommonMark renderer: authored lessons rely on its
+    # rules (e.g. "- " lines right under a paragraph stay paragraph text).
     html = md.markdown(
         markdown_text,
         extensions=["fenced_code", "tables", "toc"],
         output_format="html5",
     )
-
-    allowed_tags = set(bleach.sanitizer.ALLOWED_TAGS).union(
-        {
-            "p",
-            "pre",
-            "code",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "hr",
-            "br",
-            "table",
-            "thead",
-            "tbody",
-            "tr",
-            "th",
-            "td",
-            "details",
-            "summary",
-        }
-    )
-    if allow_images:
-        allowed_tags.add("img")
-
-    allowed_attrs = {
-        **bleach.sanitizer.ALLOWED_ATTRIBUTES,
-        "a": ["href", "title", "target", "rel"],
-        "code": ["class"],
-        "pre": ["class"],
-        "h1": ["id"],
-        "h2": ["id"],
-        "h3": ["id"],
-        "h4": ["id"],
-    }
-    if allow_images:
-        allowed_attrs["img"] = _img_attr_allowed
-
-    cleaned = bleach.clean(html, tags=list(allowed_tags), attributes=allowed_attrs, strip=True)
+    cleaned = _sanitize_html(html, allow_images=allow_images, img_src_allowed=_img_src_allowed)
     if allow_images:
         # Bleach may leave <img> tags after stripping disallowed src attributes.
         # Remove any image tag that does not retain an allowed src.
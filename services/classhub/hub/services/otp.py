@@ -0,0 +1,26 @@
+"""OTP verification helpers shared by middleware, admin, and views."""
+
+from __future__ import annotations
+
+_REQUEST_CACHE_ATTR = "_classhub_otp_verified"
+
+
+def user_is_otp_verified(user) -> bool:
+    """Return django-otp's verification flag for `user` (False when absent)."""
+    is_verified = getattr(user, "is_verified", None)
+    return bool(is_verified() if callable(is_verified) else is_verified)
+
+
+def is_otp_verified(request) -> bool:
+    """Return whether `request.user` is OTP-verified, memoized on the request.
+
+    The first caller pays for the django-otp check; later middleware and views
+    in the same request reuse the cached flag. Code that verifies a device
+    mid-request (e.g. 2FA enrollment) should call `user_is_otp_verified`.
+    """
+    cached = getattr(request, _REQUEST_CACHE_ATTR, None)
+    if cached is not None:
+        return cached
+    verified = user_is_otp_verified(getattr(request, "user", None))
+    setattr(request, _REQUEST_CACHE_ATTR, verified)
+    return verified
@@ -0,0 +1,73 @@
+"""Per-process memo of resolved (student, classroom) rows.
+
+StudentSessionMiddleware reads through this so the burst of sub-requests
+behind one student page view shares a single lookup. Entries are dropped by
+the model signal handlers in ``hub.signals``; the short TTL bounds staleness
+for writes made by other processes.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from ..models import StudentIdentity
+
+_STUDENT_CONTEXT_TTL_SECONDS = 3.0
+_STUDENT_CONTEXT_MAX_KEYS = 4096
+_student_context: OrderedDict[tuple[int, int, int | None], tuple[float, StudentIdentity]] = OrderedDict()
+_student_context_lock = threading.Lock()
+
+
+def cached_student(sid, cid, epoch: int | None) -> StudentIdentity | None:
+    """Return the session's student (with classroom), or None if stale/missing.
+
+    When the session carries a class epoch it is matched in SQL, so a rotated
+    class never hydrates rows that would be discarded.
+    """
+    key = (sid, cid, epoch)
+    now = time.monotonic()
+    with _student_context_lock:
+        entry = _student_context.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                cached = entry[1]
+            else:
+                del _student_context[key]
+                cached = None
+        else:
+            cached = None
+    if cached is not None:
+        # Hand out copies so per-request mutations never leak into the memo.
+        student = copy.copy(cached)
+        student.classroom = copy.copy(cached.classroom)
+        return student
+
+    # Student pages read nearly every column of both rows (name, return code,
+    # join code, last_seen_at heartbeat), so only the never-used ones are skipped.
+    qs = (
+        StudentIdentity.objects.select_related("classroom")
+        .defer("created_at", "classroom__content_hash")
+        .filter(id=sid, classroom_id=cid)
+    )
+    if epoch is not None:
+        qs = qs.filter(classroom__session_epoch=epoch)
+    student = qs.first()
+    if student is not None:
+        snapshot = copy.copy(student)
+        snapshot.classroom = copy.copy(student.classroom)
+        with _student_context_lock:
+            _student_context[key] = (now + _STUDENT_CONTEXT_TTL_SECONDS, snapshot)
+            _student_context.move_to_end(key)
+            while len(_student_context) > _STUDENT_CONTEXT_MAX_KEYS:
+                _student_context.popitem(last=False)
+    return student
+
+
+def forget_student_context(*, student_id=None, class_id=None) -> None:
+    """Drop memoized student lookups for one student and/or a whole class."""
+    with _student_context_lock:
+        for key in [k for k in _student_context if k[0] == student_id or k[1] == class_id]:
+            del _student_context[key]
@@ -0,0 +1,41 @@
+"""StudentEvent writes, optionally buffered into batched INSERTs.
+
+By default every event is inserted immediately. When
+``CLASSHUB_STUDENT_EVENT_FLUSH_SECONDS`` is positive, events are queued in
+process memory and flushed in batches (see ``event_buffer``). Queued events
+are lost if the worker is killed before its next flush, and ``created_at`` is
+stamped at flush time, so only enable buffering where that telemetry
+trade-off is acceptable.
+"""
+
+from __future__ import annotations
+
+from ..models import StudentEvent
+from .event_buffer import EventBuffer
+
+_buffer = EventBuffer(
+    StudentEvent,
+    flush_setting="CLASSHUB_STUDENT_EVENT_FLUSH_SECONDS",
+    batch_setting="CLASSHUB_STUDENT_EVENT_BATCH_SIZE",
+)
+
+
+def record_student_event(**fields) -> None:
+    """Insert one StudentEvent now, or queue it when buffering is enabled.
+
+    Write-through failures propagate so callers keep their existing error
+    handling; buffered failures are logged by the flusher.
+    """
+    event = StudentEvent(**fields)
+    if event.pk is not None:
+        raise ValueError("StudentEvent is append-only; new events must not carry a primary key.")
+
+    if not _buffer.enabled():
+        event.save()
+        return
+    _buffer.add(event)
+
+
+def flush_student_events() -> int:
+    """Write every queued event; returns how many rows were inserted."""
+    return _buffer.flush()
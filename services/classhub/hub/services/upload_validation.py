@@ -62,7 +62,7 @@ def validate_upload_content(upload, ext: str) -> str:
     signatures = _MAGIC_BY_EXTENSION.get(normalized_ext)
     if signatures:
         head = _read_head(upload)
-        if not any(head.startswith(sig) for sig in signatures):
+        if not head.startswith(signatures):
             return f"File content does not match {normalized_ext}."
 
     if normalized_ext == ".sb3":
@@ -1,15 +1,21 @@
-"""File cleanup hooks for storage-backed model fields.
+"""Model signal hooks for the hub app.
 
-These handlers ensure uploaded files are removed when rows are deleted or when
-file fields are replaced with new uploads.
+- File cleanup: uploaded files are removed when rows are deleted or when file
+  fields are replaced with new uploads.
+- Student session memo: cached (student, classroom) lookups are dropped when
+  either row changes, in whichever process makes the write, and the change is
+  broadcast to other workers once the transaction commits.
 """
 
 from __future__ import annotations
 
-from django.db.models.signals import post_delete, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import LessonAsset, LessonVideo, Submission
+from .models import Class, LessonAsset, LessonVideo, StudentIdentity, Submission
+from .services.context_invalidation import publish_student_context_change
+from .services.student_context import forget_student_context
 
 
 def _remove_file_from_storage(field_file) -> None:
@@ -74,3 +80,21 @@ def _lesson_video_file_replaced(sender, instance: LessonVideo, **kwargs):
 def _lesson_video_file_deleted(sender, instance: LessonVideo, **kwargs):
     _remove_file_from_storage(getattr(instance, "video_file", None))
 
+
+@receiver(post_save, sender=StudentIdentity)
+@receiver(post_delete, sender=StudentIdentity)
+def _student_identity_changed(sender, instance: StudentIdentity, **kwargs):
+    # Heartbeat saves do not change anything the middleware or views rely on.
+    if kwargs.get("update_fields") == frozenset({"last_seen_at"}):
+        return
+    forget_student_context(student_id=instance.pk)
+    student_id = instance.pk
+    transaction.on_commit(lambda: publish_student_context_change(student_id=student_id))
+
+
+@receiver(post_save, sender=Class)
+@receiver(post_delete, sender=Class)
+def _classroom_changed(sender, instance: Class, **kwargs):
+    forget_student_context(class_id=instance.pk)
+    class_id = instance.pk
+    transaction.on_commit(lambda: publish_student_context_change(class_id=class_id))
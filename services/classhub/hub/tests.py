@@ -929,6 +929,21 @@ class JoinClassTests(TestCase):
         self.assertNotIn("class_code", event.details)
         self.assertEqual(event.details.get("join_mode"), "new")
 
+    @override_settings(JOIN_RATE_LIMIT_PER_MINUTE=1)
+    def test_join_rate_limit_denial_is_memoized_per_process(self):
+        payload = {"class_code": self.classroom.join_code, "display_name": "Ada"}
+        client = Client(REMOTE_ADDR="203.0.113.77")
+        r1 = client.post("/join", data=json.dumps(payload), content_type="application/json")
+        self.assertEqual(r1.status_code, 200)
+        r2 = client.post("/join", data=json.dumps(payload), content_type="application/json")
+        self.assertEqual(r2.status_code, 429)
+        self.assertEqual(r2.json().get("error"), "rate_limited")
+
+        with patch("hub.views.student.fixed_window_allow") as mock_allow:
+            r3 = client.post("/join", data=json.dumps(payload), content_type="application/json")
+        self.assertEqual(r3.status_code, 429)
+        mock_allow.assert_not_called()
+
 
 class TeacherAuditTests(TestCase):
     def setUp(self):
@@ -985,10 +1000,32 @@ class SubmissionRetentionCommandTests(TestCase):
         self.assertEqual(Submission.objects.count(), 2)
 
     def test_prune_submissions_deletes_old_rows(self):
+        old_name = self.old.file.name
+        storage = self.old.file.storage
         call_command("prune_submissions", older_than_days=90)
         ids = set(Submission.objects.values_list("id", flat=True))
         self.assertNotIn(self.old.id, ids)
         self.assertIn(self.new.id, ids)
+        self.assertFalse(storage.exists(old_name))
+        self.assertTrue(storage.exists(self.new.file.name))
+
+
+class ImportCoursepackCommandTests(TestCase):
+    def test_unchanged_course_pack_is_not_reimported(self):
+        classroom = Class.objects.create(name="Pack Class", join_code="PACK1234")
+        call_command("import_coursepack", course_slug="piper_scratch_12_session", class_code="PACK1234")
+        module_count = classroom.modules.count()
+        self.assertGreater(module_count, 0)
+        classroom.refresh_from_db()
+        self.assertEqual(len(classroom.content_hash), 32)
+
+        out = StringIO()
+        call_command("import_coursepack", course_slug="piper_scratch_12_session", class_code="PACK1234", stdout=out)
+        self.assertIn("up to date", out.getvalue())
+        self.assertEqual(classroom.modules.count(), module_count)
+
+        call_command("import_coursepack", course_slug="piper_scratch_12_session", class_code="PACK1234", replace=True)
+        self.assertEqual(classroom.modules.count(), module_count)
 
 
 class StudentEventRetentionCommandTests(TestCase):
@@ -1441,7 +1478,7 @@ class ClassHubSecurityHeaderTests(TestCase):
         CSP_POLICY="default-src 'self'",
         CSP_REPORT_ONLY_POLICY="default-src 'self'; report-uri /__csp-report__",
         PERMISSIONS_POLICY="camera=(), microphone=()",
-        SECURITY_REFERRER_POLICY="strict-origin-when-cross-origin",
+        SECURE_REFERRER_POLICY="strict-origin-when-cross-origin",
         X_FRAME_OPTIONS="DENY",
     )
     def test_healthz_sets_security_headers(self):
@@ -1453,6 +1490,13 @@ class ClassHubSecurityHeaderTests(TestCase):
         self.assertEqual(resp["Referrer-Policy"], "strict-origin-when-cross-origin")
         self.assertEqual(resp["X-Frame-Options"], "DENY")
 
+    def test_healthz_short_circuits_before_session_middleware(self):
+        resp = self.client.get("/healthz")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, b"ok")
+        self.assertFalse(hasattr(resp.wsgi_request, "session"))
+        self.assertIn("X-Frame-Options", resp)
+
 
 class ClassHubSiteModeTests(TestCase):
     def setUp(self):
@@ -1485,6 +1529,12 @@ class ClassHubSiteModeTests(TestCase):
         self.assertContains(resp, "read-only mode", status_code=503)
         self.assertEqual(resp["Cache-Control"], "no-store")
 
+    @override_settings(SITE_MODE="read-only")
+    def test_read_only_allows_student_page_reads(self):
+        self._login_student()
+        resp = self.client.get("/student")
+        self.assertEqual(resp.status_code, 200)
+
     @override_settings(SITE_MODE="join-only")
     def test_join_only_allows_join_endpoint(self):
         resp = self.client.post(
@@ -1508,6 +1558,12 @@ class ClassHubSiteModeTests(TestCase):
         self.assertEqual(resp.status_code, 503)
         self.assertContains(resp, "maintenance mode", status_code=503)
 
+    @override_settings(SITE_MODE="maintenance")
+    def test_maintenance_matches_json_accept_header_case_insensitively(self):
+        resp = self.client.get("/student", HTTP_ACCEPT="Application/JSON")
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.json()["error"], "site_mode_restricted")
+
 
 class InternalHelperEventEndpointTests(TestCase):
     def setUp(self):
@@ -3,25 +3,37 @@ from io import BytesIO
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
 from django.http import HttpResponse
 from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from common.request_safety import fixed_window_allow, token_bucket_allow
 
 from .middleware import StudentSessionMiddleware
-from .models import Class, StudentIdentity
+from .models import AuditEvent, Class, Material, Module, StudentEvent, StudentIdentity, _normalize_asset_folder_path
 from .services.markdown_content import (
+    _render_markdown_cached,
+    load_course_manifest,
     render_markdown_to_safe_html,
     split_lesson_markdown_for_audiences,
 )
+from .services.audit import flush_audit_events, log_audit_event
+from .services.context_invalidation import handle_message
 from .services.content_links import (
     build_asset_url,
     normalize_lesson_videos,
     parse_course_lesson_url,
 )
 from .services.filenames import safe_filename
+from .services.otp import is_otp_verified
+from .services.student_context import forget_student_context
+from .services.student_events import flush_student_events, record_student_event
 from .services.release_state import (
     lesson_available_on,
     lesson_release_state,
@@ -164,6 +176,21 @@ class ReleaseStateServiceTests(SimpleTestCase):
 
 
 class MarkdownContentServiceTests(SimpleTestCase):
+    def test_load_course_manifest_returns_isolated_copies(self):
+        manifest = load_course_manifest("piper_scratch_12_session")
+        self.assertTrue(manifest.get("lessons"))
+        manifest["lessons"][0]["slug"] = "mutated"
+        manifest.pop("title", None)
+        fresh = load_course_manifest("piper_scratch_12_session")
+        self.assertNotEqual(fresh["lessons"][0]["slug"], "mutated")
+        self.assertIsNot(fresh["lessons"], manifest["lessons"])
+
+    @override_settings(CLASSHUB_CONTENT_STAT_TTL_SECONDS=60)
+    def test_load_course_manifest_reuses_recent_stat(self):
+        load_course_manifest("piper_scratch_12_session")
+        with patch("hub.services.markdown_content.Path.stat", side_effect=AssertionError("stat called")):
+            self.assertTrue(load_course_manifest("piper_scratch_12_session").get("lessons"))
+
     def test_split_lesson_markdown_for_audiences(self):
         learner, teacher = split_lesson_markdown_for_audiences(
             "## Intro\nLearner content\n\n## Teacher prep\nTeacher notes"
@@ -171,11 +198,35 @@ class MarkdownContentServiceTests(SimpleTestCase):
         self.assertIn("Learner content", learner)
         self.assertIn("Teacher notes", teacher)
 
+    def test_render_markdown_cache_is_keyed_by_asset_base_url(self):
+        text = "[Worksheet](/lesson-asset/3/download)"
+        with override_settings(CLASSHUB_ASSET_BASE_URL=""):
+            self.assertIn('href="/lesson-asset/3/download"', render_markdown_to_safe_html(text))
+        with override_settings(CLASSHUB_ASSET_BASE_URL="https://assets.example.org"):
+            self.assertIn(
+                'href="https://assets.example.org/lesson-asset/3/download"',
+                render_markdown_to_safe_html(text),
+            )
+            with patch("hub.services.markdown_content.md.markdown") as render:
+                render_markdown_to_safe_html(text)
+            render.assert_not_called()
+
     def test_render_markdown_to_safe_html_strips_script(self):
         html = render_markdown_to_safe_html("Hi<script>alert(1)</script>")
         self.assertIn("Hi", html)
         self.assertNotIn("<script", html)
 
+    def test_render_markdown_bleach_fallback_matches_nh3_policy(self):
+        text = "# Intro\n\n[x](javascript:alert(1)) [ok](https://example.org) <span onclick='x'>s</span>"
+        primary = render_markdown_to_safe_html(text)
+        _render_markdown_cached.cache_clear()
+        with patch("hub.services.markdown_content.nh3", None):
+            fallback = render_markdown_to_safe_html(text)
+        _render_markdown_cached.cache_clear()
+        self.assertEqual(primary, fallback)
+        self.assertNotIn("javascript:", primary)
+        self.assertNotIn("onclick", primary)
+
     def test_render_markdown_to_safe_html_keeps_heading_anchor_ids(self):
         html = render_markdown_to_safe_html("# Intro Heading")
         self.assertIn('id="intro-heading"', html)
@@ -270,6 +321,24 @@ class UploadValidationServiceTests(SimpleTestCase):
         self.assertIn("does not match .sb3", error)
 
 
+class OtpServiceTests(SimpleTestCase):
+    def test_is_otp_verified_memoizes_on_request(self):
+        calls = []
+
+        def _is_verified():
+            calls.append(1)
+            return True
+
+        request = SimpleNamespace(user=SimpleNamespace(is_verified=_is_verified))
+        self.assertTrue(is_otp_verified(request))
+        self.assertTrue(is_otp_verified(request))
+        self.assertEqual(len(calls), 1)
+
+    def test_is_otp_verified_false_without_otp_middleware(self):
+        request = SimpleNamespace(user=SimpleNamespace())
+        self.assertFalse(is_otp_verified(request))
+
+
 class ContentLinksServiceTests(SimpleTestCase):
     def test_parse_course_lesson_url_handles_local_or_absolute_urls(self):
         self.assertEqual(
@@ -313,6 +382,14 @@ class ContentLinksServiceTests(SimpleTestCase):
         )
 
 
+class AssetFolderPathTests(SimpleTestCase):
+    def test_normalize_asset_folder_path_slugs_each_segment(self):
+        self.assertEqual(_normalize_asset_folder_path("My Folder\\Sub Dir/"), "my-folder/sub-dir")
+        self.assertEqual(_normalize_asset_folder_path(" / //a"), "a")
+        self.assertEqual(_normalize_asset_folder_path("../x"), "unknown/x")
+        self.assertEqual(_normalize_asset_folder_path(""), "general")
+
+
 class StudentSessionMiddlewareTests(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -344,6 +421,13 @@ class StudentSessionMiddlewareTests(TestCase):
         self.assertIsNone(request.student)
         self.assertIsNone(request.classroom)
 
+    def test_browser_housekeeping_paths_skip_student_lookup_queries(self):
+        for path in ("/favicon.ico", "/robots.txt", "/apple-touch-icon-precomposed.png"):
+            request = self._request_with_student_session(path)
+            with self.assertNumQueries(0):
+                self.middleware(request)
+            self.assertIsNone(request.student)
+
     def test_admin_path_skips_student_lookup_queries(self):
         request = self._request_with_student_session("/admin/")
         with self.assertNumQueries(0):
@@ -359,3 +443,152 @@ class StudentSessionMiddlewareTests(TestCase):
         self.assertIsNotNone(request.classroom)
         self.assertEqual(request.student.id, self.student.id)
         self.assertEqual(request.classroom.id, self.classroom.id)
+
+    def test_student_lookup_is_memoized_until_class_changes(self):
+        self.middleware(self._request_with_student_session("/student"))
+        request = self._request_with_student_session("/student")
+        with self.assertNumQueries(0):
+            self.middleware(request)
+        self.assertEqual(request.student.id, self.student.id)
+        self.assertIsNot(request.student, self.student)
+
+        self.classroom.session_epoch += 1
+        self.classroom.save(update_fields=["session_epoch"])
+        request = self._request_with_student_session("/student")
+        request.session["class_epoch"] = self.classroom.session_epoch - 1
+        with self.assertNumQueries(1):
+            self.middleware(request)
+        self.assertIsNone(request.student)
+
+    def test_class_change_broadcast_drops_memo_in_other_workers(self):
+        with patch("hub.signals.publish_student_context_change") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.classroom.save(update_fields=["is_locked"])
+        publish.assert_called_once_with(class_id=self.classroom.id)
+
+        # Simulate this worker receiving another worker's broadcast.
+        self.middleware(self._request_with_student_session("/student"))
+        handle_message(f'{{"student_id": null, "class_id": {self.classroom.id}}}', forget_student_context)
+        request = self._request_with_student_session("/student")
+        with self.assertNumQueries(1):
+            self.middleware(request)
+        self.assertEqual(request.student.id, self.student.id)
+
+    def test_student_page_reads_class_row_once_per_request(self):
+        # Views reuse request.classroom; nothing downstream should re-select it.
+        module = Module.objects.create(classroom=self.classroom, title="Session 1", order_index=0)
+        Material.objects.create(module=module, title="Upload", type=Material.TYPE_UPLOAD)
+        session = self.client.session
+        session["student_id"] = self.student.id
+        session["class_id"] = self.classroom.id
+        session["class_epoch"] = self.classroom.session_epoch
+        session.save()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/student")
+        self.assertEqual(response.status_code, 200)
+        class_reads = [q["sql"] for q in ctx.captured_queries if '"hub_class"' in q["sql"]]
+        self.assertEqual(len(class_reads), 1)
+
+
+class StudentEventServiceTests(TestCase):
+    def setUp(self):
+        self.classroom = Class.objects.create(name="Events", join_code="EVTS1234")
+
+    def test_record_student_event_writes_through_by_default(self):
+        record_student_event(classroom=self.classroom, event_type=StudentEvent.EVENT_CLASS_JOIN, details={})
+        self.assertEqual(StudentEvent.objects.count(), 1)
+
+    @override_settings(CLASSHUB_STUDENT_EVENT_FLUSH_SECONDS=60)
+    def test_buffered_events_are_written_in_one_flush(self):
+        with patch("hub.services.student_events._buffer._ensure_flusher"):
+            for _ in range(3):
+                record_student_event(classroom=self.classroom, event_type=StudentEvent.EVENT_CLASS_JOIN, details={})
+        self.assertEqual(StudentEvent.objects.count(), 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(flush_student_events(), 3)
+        self.assertEqual(StudentEvent.objects.count(), 3)
+
+    @override_settings(CLASSHUB_AUDIT_EVENT_FLUSH_SECONDS=60)
+    def test_buffered_audit_events_queue_only_after_commit(self):
+        request = RequestFactory().post("/teach/lock", REMOTE_ADDR="203.0.113.9")
+        request.user = AnonymousUser()
+        with patch("hub.services.audit._buffer._ensure_flusher"):
+            with self.captureOnCommitCallbacks(execute=False):
+                log_audit_event(request, action="class.lock", classroom=self.classroom)
+            with self.captureOnCommitCallbacks(execute=True):
+                log_audit_event(request, action="class.unlock", classroom=self.classroom)
+        self.assertEqual(AuditEvent.objects.count(), 0)
+        self.assertEqual(flush_audit_events(), 1)
+        event = AuditEvent.objects.get()
+        self.assertEqual(event.action, "class.unlock")
+        self.assertEqual(event.ip_address, "203.0.113.9")
+
+    @override_settings(CLASSHUB_AUDIT_EVENT_FLUSH_SECONDS=60)
+    def test_buffered_audit_enqueue_failure_does_not_raise_at_commit(self):
+        request = RequestFactory().post("/teach/lock")
+        request.user = AnonymousUser()
+        with patch("hub.services.audit._buffer.add", side_effect=RuntimeError("queue down")) as add:
+            with self.assertLogs("django", level="ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    log_audit_event(request, action="class.lock", classroom=self.classroom)
+        add.assert_called_once()
+
+
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = get_user_model().objects.create_superuser("admin", "admin@example.org", "pw")
+        classroom = Class.objects.create(name="Admin Class", join_code="ADMN1234")
+        module = Module.objects.create(classroom=classroom, title="Session 1", order_index=0)
+        Material.objects.create(module=module, title="Upload", type=Material.TYPE_UPLOAD, body="x" * 2000)
+
+    def test_material_changelist_defers_body_and_joins_classroom(self):
+        request = self.factory.get("/admin/hub/material/")
+        request.user = self.user
+        changelist = admin.site._registry[Material].get_changelist_instance(request)
+        rows = list(changelist.result_list)
+        self.assertEqual(len(rows), 1)
+        self.assertIn("body", rows[0].get_deferred_fields())
+        with self.assertNumQueries(0):
+            str(rows[0].module)
+
+    @override_settings(ADMIN_2FA_REQUIRED=False)
+    def test_student_event_changelist_reuses_cached_page_until_new_event(self):
+        classroom = Class.objects.get(join_code="ADMN1234")
+        StudentEvent.objects.create(classroom=classroom, event_type=StudentEvent.EVENT_CLASS_JOIN, details={})
+        model_admin = admin.site._registry[StudentEvent]
+
+        def get():
+            request = self.factory.get("/admin/hub/studentevent/")
+            request.user = self.user
+            request.COOKIES["csrftoken"] = "c" * 32
+            return model_admin.changelist_view(request)
+
+        page = HttpResponse(b"page", headers={"Content-Language": "en"})
+        with patch.object(admin.ModelAdmin, "changelist_view", return_value=page) as rendered:
+            self.assertEqual(get().content, b"page")
+            cached = get()
+            self.assertEqual(cached.content, b"page")
+            self.assertEqual(cached["Content-Language"], "en")
+            self.assertEqual(rendered.call_count, 1)
+
+            StudentEvent.objects.create(classroom=classroom, event_type=StudentEvent.EVENT_CLASS_JOIN, details={})
+            get()
+            self.assertEqual(rendered.call_count, 2)
+
+    @override_settings(ADMIN_2FA_REQUIRED=False)
+    def test_student_event_changelist_cache_rechecks_permissions(self):
+        model_admin = admin.site._registry[StudentEvent]
+
+        def get():
+            request = self.factory.get("/admin/hub/studentevent/")
+            request.user = self.user
+            request.COOKIES["csrftoken"] = "c" * 32
+            return model_admin.changelist_view(request)
+
+        with patch.object(admin.ModelAdmin, "changelist_view", return_value=HttpResponse(b"page")) as rendered:
+            get()
+            self.user.is_superuser = False
+            self.user.save(update_fields=["is_superuser"])
+            get()
+            self.assertEqual(rendered.call_count, 2)
@@ -56,7 +56,7 @@ from ..models import (
 
 # --- Repo-authored course content (markdown) ---------------------------------
 
-_COURSES_DIR = Path(settings.CONTENT_ROOT) / "courses"
+_COURSES_DIR = Path(settings.CONTENT_COURSES_ROOT)
 _YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be", "www.youtu.be", "youtube-nocookie.com", "www.youtube-nocookie.com"}
 _COURSE_LESSON_PATH_RE = re.compile(r"^/course/(?P<course_slug>[-a-zA-Z0-9_]+)/(?P<lesson_slug>[-a-zA-Z0-9_]+)$")
 _HEADING_LEVEL2_RE = re.compile(r"^##\s+(.+?)\s*$")
@@ -72,7 +72,7 @@ _TEACHER_SECTION_PREFIXES = (
     "extensions (fast finisher menu)",
     "notes + options",
 )
-_VIDEO_EXTENSIONS = {
+_VIDEO_EXTENSIONS = (
     ".m3u8",
     ".mp4",
     ".m4v",
@@ -80,7 +80,7 @@ _VIDEO_EXTENSIONS = {
     ".webm",
     ".ogg",
     ".ogv",
-}
+)
 
 
 def _validate_front_matter(front_matter_text: str, source: Path) -> None:
@@ -145,7 +145,7 @@ def _is_teacher_section_heading(heading_text: str) -> bool:
         return False
     if normalized.startswith("teacher "):
         return True
-    return any(normalized.startswith(prefix) for prefix in _TEACHER_SECTION_PREFIXES)
+    return normalized.startswith(_TEACHER_SECTION_PREFIXES)
 
 
 def _split_lesson_markdown_for_audiences(markdown_text: str) -> tuple[str, str]:
@@ -322,7 +322,7 @@ def _is_probably_video_url(url: str) -> bool:
         return False
     parsed = urlparse(url)
     path = (parsed.path or "").lower()
-    return any(path.endswith(ext) for ext in _VIDEO_EXTENSIONS)
+    return path.endswith(_VIDEO_EXTENSIONS)
 
 
 def _video_mime_type(url: str) -> str:
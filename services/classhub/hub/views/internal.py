@@ -13,6 +13,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
 from ..models import StudentEvent
+from ..services.student_events import record_student_event
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +117,7 @@ def internal_helper_chat_access_event(request):
         return JsonResponse({"ok": True, "skipped": "no_actor"})
 
     try:
-        StudentEvent.objects.create(
+        record_student_event(
             classroom_id=classroom_id if classroom_id > 0 else None,
             student_id=student_id if student_id > 0 else None,
             event_type=StudentEvent.EVENT_HELPER_CHAT_ACCESS,
@@ -3,7 +3,10 @@
 import json
 import logging
 import tempfile
+import threading
+import time
 import zipfile
+from collections import OrderedDict
 from pathlib import Path
 
 from django.conf import settings
@@ -33,6 +36,7 @@ from ..services.content_links import parse_course_lesson_url
 from ..services.filenames import safe_filename
 from ..services.markdown_content import load_lesson_markdown
 from ..services.release_state import lesson_release_override_map, lesson_release_state
+from ..services.student_events import record_student_event
 from ..services.upload_scan import scan_uploaded_file
 from ..services.upload_validation import validate_upload_content
 from ..services.upload_policy import parse_extensions
@@ -40,6 +44,32 @@ from common.request_safety import client_ip_from_request, fixed_window_allow
 
 logger = logging.getLogger(__name__)
 
+# Per-process memo of join rate-limit keys that already hit their limit. Repeat
+# attempts inside the short TTL are refused without a shared-cache round-trip.
+# Only denials are memoized, so allowed joins always consult the shared counter.
+_JOIN_DENIED_MAX_KEYS = 4096
+_JOIN_DENIED_TTL_SECONDS = 5.0
+_join_denied_until: OrderedDict[str, float] = OrderedDict()
+_join_denied_lock = threading.Lock()
+
+
+def _join_rate_allowed(key: str, *, limit: int, request_id: str) -> bool:
+    now = time.monotonic()
+    with _join_denied_lock:
+        deadline = _join_denied_until.get(key)
+        if deadline is not None:
+            if deadline > now:
+                return False
+            del _join_denied_until[key]
+    if fixed_window_allow(key, limit=limit, window_seconds=60, request_id=request_id):
+        return True
+    with _join_denied_lock:
+        _join_denied_until[key] = now + _JOIN_DENIED_TTL_SECONDS
+        _join_denied_until.move_to_end(key)
+        while len(_join_denied_until) > _JOIN_DENIED_MAX_KEYS:
+            _join_denied_until.popitem(last=False)
+    return False
+
 
 def _json_no_store_response(payload: dict, *, status: int = 200, private: bool = False) -> JsonResponse:
     response = JsonResponse(payload, status=status)
@@ -57,7 +87,7 @@ def _emit_student_event(
     ip_address: str = "",
 ) -> None:
     try:
-        StudentEvent.objects.create(
+        record_student_event(
             classroom=classroom,
             student=student,
             event_type=event_type,
@@ -174,12 +204,7 @@ def join_class(request):
     )
     request_id = (request.META.get("HTTP_X_REQUEST_ID", "") or "").strip()
     join_limit = int(getattr(settings, "JOIN_RATE_LIMIT_PER_MINUTE", 20))
-    if not fixed_window_allow(
-        f"join:ip:{client_ip}:m",
-        limit=join_limit,
-        window_seconds=60,
-        request_id=request_id,
-    ):
+    if not _join_rate_allowed(f"join:ip:{client_ip}:m", limit=join_limit, request_id=request_id):
         return _json_no_store_response({"error": "rate_limited"}, status=429)
 
     code = (payload.get("class_code") or "").strip().upper()
@@ -189,14 +214,13 @@ def join_class(request):
     if not code or not name:
         return _json_no_store_response({"error": "missing_fields"}, status=400)
 
-    classroom = Class.objects.filter(join_code=code).first()
-    if not classroom:
-        return _json_no_store_response({"error": "invalid_code"}, status=404)
-    if classroom.is_locked:
-        return _json_no_store_response({"error": "class_locked"}, status=403)
-
     with transaction.atomic():
-        Class.objects.select_for_update().filter(id=classroom.id).first()
+        # One locking read both resolves the code and serializes joins per class.
+        classroom = Class.objects.select_for_update().filter(join_code=code).first()
+        if not classroom:
+            return _json_no_store_response({"error": "invalid_code"}, status=404)
+        if classroom.is_locked:
+            return _json_no_store_response({"error": "class_locked"}, status=403)
 
         student = None
         rejoined = False
@@ -227,7 +251,7 @@ def join_class(request):
 
     request.session["student_id"] = student.id
     request.session["class_id"] = classroom.id
-    request.session["class_epoch"] = int(getattr(classroom, "session_epoch", 1) or 1)
+    request.session["class_epoch"] = classroom.session_epoch
 
     response = _json_no_store_response({"ok": True, "return_code": student.return_code, "rejoined": rejoined})
     _apply_device_hint_cookie(response, classroom, student)
@@ -465,8 +489,10 @@ def material_upload(request, material_id: int):
     if getattr(request, "student", None) is None or getattr(request, "classroom", None) is None:
         return redirect("/")
 
+    # module is joined so _submission_upload_to can read module.classroom_id
+    # without a lazy query; the classroom row itself comes from request.classroom.
     material = (
-        Material.objects.select_related("module__classroom")
+        Material.objects.select_related("module")
         .filter(id=material_id)
         .first()
     )
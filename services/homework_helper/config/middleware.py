@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.http import JsonResponse
+from tutor.views import healthz
 
 
 class SecurityHeadersMiddleware:
@@ -7,31 +8,44 @@ class SecurityHeadersMiddleware:
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Settings are fixed for the life of the process, so resolve the
+        # header values once instead of on every response.
+        self._headers = tuple(
+            (header, value)
+            for header, value in (
+                ("Content-Security-Policy", self._setting("CSP_POLICY")),
+                ("Content-Security-Policy-Report-Only", self._setting("CSP_REPORT_ONLY_POLICY")),
+                ("Permissions-Policy", self._setting("PERMISSIONS_POLICY")),
+            )
+            if value
+        )
+
+    @staticmethod
+    def _setting(name: str) -> str:
+        return (getattr(settings, name, "") or "").strip()
 
     def __call__(self, request):
         response = self.get_response(request)
-        csp_policy = (getattr(settings, "CSP_POLICY", "") or "").strip()
-        if csp_policy and "Content-Security-Policy" not in response:
-            response["Content-Security-Policy"] = csp_policy
-        csp_report_only = (getattr(settings, "CSP_REPORT_ONLY_POLICY", "") or "").strip()
-        if csp_report_only and "Content-Security-Policy-Report-Only" not in response:
-            response["Content-Security-Policy-Report-Only"] = csp_report_only
-        permissions_policy = (getattr(settings, "PERMISSIONS_POLICY", "") or "").strip()
-        if permissions_policy and "Permissions-Policy" not in response:
-            response["Permissions-Policy"] = permissions_policy
-        referrer_policy = (
-            getattr(settings, "SECURITY_REFERRER_POLICY", None)
-            or getattr(settings, "SECURE_REFERRER_POLICY", "")
-            or ""
-        ).strip()
-        if referrer_policy and "Referrer-Policy" not in response:
-            response["Referrer-Policy"] = referrer_policy
-        x_frame_options = (getattr(settings, "X_FRAME_OPTIONS", "") or "").strip()
-        if x_frame_options and "X-Frame-Options" not in response:
-            response["X-Frame-Options"] = x_frame_options
+        for header, value in self._headers:
+            if header not in response:
+                response[header] = value
         return response
 
 
+class FastPathMiddleware:
+    """Answer liveness probes without running the session/auth stack."""
+
+    _HEALTHZ_PATHS = frozenset({"/helper/healthz"})
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path in self._HEALTHZ_PATHS:
+            return healthz(request)
+        return self.get_response(request)
+
+
 class SiteModeMiddleware:
     """Gate helper chat when the platform is intentionally degraded."""
 
@@ -58,7 +72,7 @@ class SiteModeMiddleware:
 
     @classmethod
     def _is_always_allowed(cls, path: str) -> bool:
-        return any(path.startswith(prefix) for prefix in cls._ALWAYS_ALLOWED_PREFIXES)
+        return path.startswith(cls._ALWAYS_ALLOWED_PREFIXES)
 
     def __call__(self, request):
         mode = self._site_mode()
@@ -67,7 +67,11 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Kept outside FastPathMiddleware so health probes get the framing header.
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "config.middleware.SecurityHeadersMiddleware",
+    # Answers /helper/healthz before sessions/auth/messages run.
+    "config.middleware.FastPathMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "config.middleware.SiteModeMiddleware",
@@ -75,7 +79,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django_otp.middleware.OTPMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -101,6 +104,15 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": env.db(default=f"sqlite:///{BASE_DIR/'db.sqlite3'}")
 }
+# Each chat request does a single-row hub_studentidentity lookup against the
+# shared Postgres, so reconnecting per request would cost more than the query.
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("DJANGO_DB_CONN_MAX_AGE", default=60)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+# Set when connecting through PgBouncer in transaction-pooling mode: named
+# server-side cursors (QuerySet.iterator) cannot outlive a pooled transaction.
+DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = env.bool(
+    "DJANGO_DB_DISABLE_SERVER_SIDE_CURSORS", default=False
+)
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = env("DJANGO_TIME_ZONE", default="America/Chicago").strip() or "America/Chicago"
@@ -151,6 +163,9 @@ SECURITY_REFERRER_POLICY = (
     env("DJANGO_SECURE_REFERRER_POLICY", default="strict-origin-when-cross-origin").strip()
     or "strict-origin-when-cross-origin"
 )
+# Referrer-Policy and X-Frame-Options come from Django's SecurityMiddleware and
+# XFrameOptionsMiddleware; SecurityHeadersMiddleware only adds CSP/Permissions.
+SECURE_REFERRER_POLICY = SECURITY_REFERRER_POLICY
 X_FRAME_OPTIONS = (env("DJANGO_X_FRAME_OPTIONS", default="SAMEORIGIN").strip() or "SAMEORIGIN").upper()
 
 if not DEBUG:
@@ -159,7 +174,6 @@ if not DEBUG:
     SECURE_HSTS_INCLUDE_SUBDOMAINS = env.bool("DJANGO_SECURE_HSTS_INCLUDE_SUBDOMAINS", default=False)
     SECURE_HSTS_PRELOAD = env.bool("DJANGO_SECURE_HSTS_PRELOAD", default=False)
     SECURE_CONTENT_TYPE_NOSNIFF = True
-    SECURE_REFERRER_POLICY = SECURITY_REFERRER_POLICY
 
 # Shared request-safety controls for proxy-aware client IP extraction.
 # Safe-by-default: only trust forwarded headers when explicitly enabled.
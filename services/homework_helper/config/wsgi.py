@@ -2,9 +2,23 @@ import os
 import sys
 from pathlib import Path
 from django.core.wsgi import get_wsgi_application
+from django.urls import Resolver404, get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 SERVICES_DIR = Path(__file__).resolve().parents[2]
 if str(SERVICES_DIR) not in sys.path:
     sys.path.insert(0, str(SERVICES_DIR))
 application = get_wsgi_application()
+
+
+def _warm_urlconf() -> None:
+    """Import the URLconf and its view modules while the worker boots."""
+    # The helper runs as its own gunicorn process with its own URLconf, so it
+    # warms separately from Class Hub.
+    try:
+        get_resolver().resolve("/helper/healthz")
+    except Resolver404:
+        pass
+
+
+_warm_urlconf()
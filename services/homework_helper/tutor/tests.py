@@ -644,7 +644,7 @@ class HelperSecurityHeaderTests(TestCase):
         CSP_POLICY="default-src 'self'",
         CSP_REPORT_ONLY_POLICY="default-src 'self'; report-uri /__csp-report__",
         PERMISSIONS_POLICY="camera=(), microphone=()",
-        SECURITY_REFERRER_POLICY="strict-origin-when-cross-origin",
+        SECURE_REFERRER_POLICY="strict-origin-when-cross-origin",
         X_FRAME_OPTIONS="DENY",
     )
     def test_healthz_sets_security_headers(self):
@@ -656,6 +656,13 @@ class HelperSecurityHeaderTests(TestCase):
         self.assertEqual(resp["Referrer-Policy"], "strict-origin-when-cross-origin")
         self.assertEqual(resp["X-Frame-Options"], "DENY")
 
+    def test_healthz_short_circuits_before_session_middleware(self):
+        resp = self.client.get("/helper/healthz")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json().get("ok"))
+        self.assertFalse(hasattr(resp.wsgi_request, "session"))
+        self.assertIn("X-Frame-Options", resp)
+
 
 class HelperSiteModeTests(TestCase):
     @override_settings(SITE_MODE="join-only")